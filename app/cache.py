@@ -0,0 +1,162 @@
+"""
+In-process caches for rarely-changing lookups
+"""
+import asyncio
+import hashlib
+import inspect
+from functools import wraps
+from typing import Awaitable, Callable, Dict, Optional
+
+from cachetools import TTLCache
+from fastapi_cache import FastAPICache
+from fastapi_cache.key_builder import default_key_builder
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Books are effectively static, so existence checks are cached per worker.
+# Only positive hits are stored so newly added books show up immediately.
+book_exists_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# Detached Book rows by book_id; misses are not cached either.
+book_cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+
+# Fingerprint of the whole book table, used as the book list ETag
+books_version_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+
+# Results of @cached service queries (counts and other small aggregates)
+query_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+
+def invalidate_book(book_id: int):
+    """Drop cached lookups for a book; call from any path that modifies or deletes it"""
+    book_exists_cache.pop(book_id, None)
+    book_cache.pop(book_id, None)
+    books_version_cache.clear()
+    # Keys are per method and argument tuple, so drop every aggregate rather than guess
+    query_cache.clear()
+
+
+def cached(cache: TTLCache = query_cache):
+    """
+    Cache a service query's result in `cache`, keyed by method and arguments.
+
+    For async service methods whose first parameter is the database session, which is
+    left out of the key. Results should be plain values (counts, rows), not ORM instances
+    attached to a session. None is not cached.
+
+    Misses are single-flight: while one call runs the query, concurrent calls with the same
+    key wait for its result instead of each running (and holding a connection for) their own.
+    """
+    def wrapper(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        inflight: Dict[tuple, asyncio.Future] = {}
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__, *list(bound.arguments.values())[1:])
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+            pending = inflight.get(key)
+            if pending is not None:
+                # Waiting never cancels the shared call; if it failed, run the query here
+                await asyncio.wait({pending})
+                result = cache.get(key)
+                if result is not None:
+                    return result
+                return await func(*args, **kwargs)
+
+            inflight[key] = asyncio.get_running_loop().create_future()
+            try:
+                result = await func(*args, **kwargs)
+                if result is not None:
+                    cache[key] = result
+                return result
+            finally:
+                inflight.pop(key).set_result(None)
+
+        return inner
+
+    return wrapper
+
+
+def request_key_builder(
+    func: Callable,
+    namespace: Optional[str] = "",
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Optional[tuple] = None,
+    kwargs: Optional[dict] = None,
+) -> str:
+    """
+    Build response cache keys from the request path and query string.
+
+    The default builder hashes the endpoint kwargs, which include the per-request
+    database session and would never produce a hit. The ETag set by conditional_get is
+    part of the key, so a changed resource never reuses a body cached for its old tag.
+    """
+    if request is None:
+        return default_key_builder(func, namespace, request, response, args, kwargs)
+
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    etag = getattr(request.state, "etag", "")
+    digest = hashlib.md5(f"{request.url.path}?{query}#{etag}".encode()).hexdigest()  # nosec: not used for security
+    return f"{FastAPICache.get_prefix()}:{namespace}:{func.__module__}:{func.__name__}:{digest}"
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Weak comparison against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_get(etag_for: Callable[..., Awaitable[Optional[str]]], max_age: int = 300):
+    """
+    Add ETag validation and shared-cache headers to a GET endpoint.
+
+    `etag_for` is called with the endpoint's keyword arguments and returns the entity tag,
+    or None to skip (e.g. the resource does not exist). A matching If-None-Match is answered
+    with 304 before the endpoint runs. Apply above @cache: fastapi-cache derives its own ETag
+    from a per-process hash, so it differs between workers and is overwritten here, and the
+    tag computed here is folded into the response cache key.
+    """
+    def wrapper(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        passes = {name: name in signature.parameters for name in ("request", "response")}
+        for name, annotation in (("request", Request), ("response", Response)):
+            if not passes[name]:
+                parameters.append(inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation))
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            request: Request = kwargs["request"] if passes["request"] else kwargs.pop("request")
+            response: Response = kwargs["response"] if passes["response"] else kwargs.pop("response")
+
+            etag = await etag_for(**kwargs)
+            if etag is None:
+                return await func(*args, **kwargs)
+
+            headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+            if _etag_matches(etag, request.headers.get("if-none-match")):
+                return Response(status_code=304, headers=headers)
+
+            # Keys the response cache (request_key_builder), tying the cached body to this tag
+            request.state.etag = etag
+            result = await func(*args, **kwargs)
+            # Returned Response objects bypass the injected response's headers
+            target = result if isinstance(result, Response) else response
+            target.headers.update(headers)
+            return result
+
+        inner.__signature__ = signature.replace(parameters=parameters)
+        return inner
+
+    return wrapper
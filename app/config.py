@@ -1,54 +1,64 @@
-from pydantic_settings import BaseSettings
+from pydantic import AliasChoices, Field, computed_field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 from typing import Optional
-import os
 
 
 class Settings(BaseSettings):
-    # Database configuration
-    database_url: Optional[str] = None
-    database_host: str = "localhost"
-    database_port: int = 5432
-    database_name: str = "pure_bhakti_vault"
-    database_user: str = "postgres"
-    database_password: str = "postgres"
+    model_config = SettingsConfigDict(env_file=".env", extra="allow", populate_by_name=True, frozen=True)
+
+    # Database configuration. An explicit DATABASE_URL wins over the individual parts;
+    # legacy DB_* variables take precedence over DATABASE_* for backwards compatibility.
+    database_url_override: Optional[str] = Field(None, validation_alias=AliasChoices("database_url"))
+    database_host: str = Field("localhost", validation_alias=AliasChoices("db_host", "database_host"))
+    database_port: int = Field(5432, validation_alias=AliasChoices("db_port", "database_port"))
+    database_name: str = Field("pure_bhakti_vault", validation_alias=AliasChoices("db_name", "database_name"))
+    database_user: str = Field("postgres", validation_alias=AliasChoices("db_user", "database_user"))
+    database_password: str = Field("postgres", validation_alias=AliasChoices("db_password", "database_password"))
 
     # Database connection timeout settings (in seconds)
     database_connect_timeout: int = 30
     database_command_timeout: int = 60
     database_pool_timeout: int = 30
 
-    # Legacy fields for backwards compatibility
-    db_host: Optional[str] = None
-    db_port: Optional[int] = None
-    db_name: Optional[str] = None
-    db_user: Optional[str] = None
-    db_password: Optional[str] = None
-
-    class Config:
-        env_file = ".env"
-        extra = "allow"
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        # Handle legacy environment variables
-        if self.db_host:
-            self.database_host = self.db_host
-        if self.db_port:
-            self.database_port = self.db_port
-        if self.db_name:
-            self.database_name = self.db_name
-        if self.db_user:
-            self.database_user = self.db_user
-        if self.db_password:
-            self.database_password = self.db_password
-
-        # Build database_url if not provided
-        if not self.database_url:
-            self.database_url = f"postgresql://{self.database_user}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
+    # Database connection pool sizing. Each worker process holds up to
+    # pool_size + max_overflow connections, so (pool_size + max_overflow) * workers
+    # must stay below the Postgres max_connections limit. The defaults give the Docker
+    # image's 4 workers (10 + 5) * 4 = 60 connections, leaving headroom under
+    # Postgres' default max_connections=100 for migrations, admin sessions and monitoring.
+    database_pool_size: int = 10
+    database_max_overflow: int = 5
+    # Keep below the server's idle_in_transaction_session_timeout
+    database_pool_recycle: int = 1800
+    # Pinging on every checkout costs a round-trip per request; by default idle connections
+    # are validated in the background every pool_validation_interval seconds instead.
+    database_pool_pre_ping: bool = False
+    database_pool_validation_interval: int = 60
+
+    # Per-connection prepared statement caches (SQLAlchemy's asyncpg adapter and asyncpg itself).
+    # Set both to 0 when connecting through PgBouncer in transaction pooling mode.
+    database_prepared_statement_cache_size: int = 256
+    database_statement_cache_size: int = 1024
+    # SQLAlchemy's compiled SQL cache, shared by the engine (SQLAlchemy's default is 500)
+    database_query_cache_size: int = 1200
+
+    # HNSW search breadth for glossary semantic search (pgvector's default is 40)
+    hnsw_ef_search: int = 40
+
+    # Optional Redis (e.g. redis://localhost:6379/0) sharing cached query embeddings across workers
+    redis_url: Optional[str] = None
+
+    # Create missing tables on startup (development only; production schema is managed externally)
+    auto_create_tables: bool = False
+
+    @computed_field
+    @property
+    def database_url(self) -> str:
+        if self.database_url_override:
+            return self.database_url_override
+        return f"postgresql://{self.database_user}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
 
 
 @lru_cache()
 def get_settings():
-    return Settings()
\ No newline at end of file
+    return Settings()
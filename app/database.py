@@ -1,31 +1,69 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
+# Settings keep the plain postgresql:// URL; the async engine needs the asyncpg driver
+database_url = make_url(settings.database_url).set(drivername="postgresql+asyncpg")
+
 # Create engine with proper timeout configurations
-engine = create_engine(
-    settings.database_url,
+engine = create_async_engine(
+    database_url,
     # Connection pool settings
+    pool_size=settings.database_pool_size,  # Persistent connections kept in the pool
+    max_overflow=settings.database_max_overflow,  # Extra connections allowed under burst load
     pool_timeout=settings.database_pool_timeout,  # Time to wait for connection from pool
-    pool_recycle=3600,  # Recycle connections after 1 hour to avoid stale connections
-    pool_pre_ping=True,  # Verify connections before use
+    pool_recycle=settings.database_pool_recycle,  # Recycle connections to avoid stale connections
+    pool_pre_ping=settings.database_pool_pre_ping,  # Verify connections before use (see validate_idle_connections)
+    query_cache_size=settings.database_query_cache_size,  # Compiled SQL kept per statement shape
     # Connection timeout settings
     connect_args={
-        "connect_timeout": settings.database_connect_timeout,  # Connection timeout
-        "options": f"-c statement_timeout={settings.database_command_timeout * 1000}"  # Query timeout in ms
+        "timeout": settings.database_connect_timeout,  # Connection timeout
+        # Reuse server-side prepared statements so hot queries skip parse/plan
+        "prepared_statement_cache_size": settings.database_prepared_statement_cache_size,
+        "statement_cache_size": settings.database_statement_cache_size,
+        "server_settings": {
+            "statement_timeout": str(settings.database_command_timeout * 1000)  # Query timeout in ms
+        }
     }
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+async def validate_idle_connections():
+    """Ping each idle pooled connection, invalidating any that fail so they are replaced on next checkout"""
+    # One connection at a time, so the pool never loses more than one idle connection to the
+    # check. The pool hands out connections FIFO and a checked-in one goes to the back, so
+    # checkedin() consecutive checkouts visit each idle connection once.
+    for _ in range(engine.pool.checkedin()):
+        async with engine.connect() as conn:
+            try:
+                await conn.execute(text("SELECT 1"))
+            except Exception as e:
+                logger.warning(f"Invalidating stale pooled connection: {str(e)}")
+                await conn.invalidate()
+
+
+async def run_pool_validator(interval: int):
+    """Background loop replacing per-checkout pre-ping"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await validate_idle_connections()
+        except Exception as e:
+            logger.error(f"Connection pool validation failed: {str(e)}")
@@ -1,25 +1,98 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from sqlalchemy import text
 from app.routers.routes import router
-from app.database import engine
+from app.database import AsyncSessionLocal, engine, run_pool_validator
 from app.models.models import Base
 from app.config import get_settings
+from app.cache import request_key_builder
+from app.services.ollama_service import ollama_service
+from app.services.services import detect_embedding_type
+from app.services.term_index import glossary_term_index
+from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
+
+
+async def create_tables():
+    """Create missing database tables when enabled (development only)"""
+    if not get_settings().auto_create_tables:
+        return
+    async with engine.begin() as conn:
+        # Extensions used by column types and indexes
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    await create_tables()
+
+    # Cache GET responses in memory; content changes rarely so short TTLs are safe
+    FastAPICache.init(InMemoryBackend(), prefix="pbb-cache", key_builder=request_key_builder)
+
+    # In-memory term index for the text search fallback; ILIKE still works without it
+    try:
+        async with AsyncSessionLocal() as db:
+            await glossary_term_index.load(db)
+    except Exception as e:
+        logger.error(f"Could not build glossary term index: {str(e)}")
+
+    # Semantic search casts query vectors to the stored embedding type (halfvec once
+    # migration 006 has run on pgvector >= 0.7, vector before)
+    try:
+        async with AsyncSessionLocal() as db:
+            embedding_type = await detect_embedding_type(db)
+        if embedding_type != "halfvec":
+            logger.warning(
+                f"glossary_embeddings.embedding is {embedding_type}, not halfvec; "
+                "apply migrations/006_glossary_embeddings_halfvec.sql (needs pgvector >= 0.7)"
+            )
+    except Exception as e:
+        logger.error(f"Could not determine the glossary embedding type; semantic search may fail: {str(e)}")
+
+    # One pooled HTTP client for all embedding requests
+    await ollama_service.start(redis_url=settings.redis_url)
+
+    # Validate idle database connections in the background when pre-ping is disabled
+    pool_validator = None
+    if not settings.database_pool_pre_ping and settings.database_pool_validation_interval > 0:
+        pool_validator = asyncio.create_task(run_pool_validator(settings.database_pool_validation_interval))
+
+    yield
+
+    if pool_validator:
+        pool_validator.cancel()
+    await ollama_service.close()
+    await engine.dispose()
+
 
 app = FastAPI(
     title="Pure Bhakti Vault API",
     description="RESTful API for Pure Bhakti spiritual content including books, articles, lectures, and verses",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+
 # Configure CORS for multiple platforms
 def get_cors_origins():
     """Get CORS origins based on environment"""
+    # In development, allow all origins for testing
+    if os.getenv("ENVIRONMENT", "development") == "development":
+        return ("*",)
+
     # Development origins
     dev_origins = [
         "http://localhost:3000",     # React dev server
@@ -49,19 +122,17 @@ def get_cors_origins():
     custom_origins = os.getenv("CORS_ORIGINS", "").split(",")
     custom_origins = [origin.strip() for origin in custom_origins if origin.strip()]
 
-    # Combine all origins
+    # Combine all origins, removing duplicates while keeping their order
     all_origins = dev_origins + prod_origins + mobile_origins + custom_origins
+    return tuple(dict.fromkeys(all_origins))
 
-    # In development, allow all origins for testing
-    if os.getenv("ENVIRONMENT", "development") == "development":
-        return ["*"]
 
-    return list(set(all_origins))  # Remove duplicates
+CORS_ORIGINS = get_cors_origins()
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=get_cors_origins(),
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Support all methods
     allow_headers=[
@@ -74,7 +145,7 @@ app.add_middleware(
         "X-API-Key",
         "Cache-Control",
     ],
-    expose_headers=["X-Total-Count", "X-Page", "X-Per-Page"],  # Useful for pagination
+    expose_headers=["X-Total-Count", "X-Page", "X-Per-Page", "ETag"],  # Useful for pagination and revalidation
 )
 
 # Include routers
@@ -93,4 +164,24 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "service": "pure-bhakti-apis"}
\ No newline at end of file
+    return {"status": "healthy", "service": "pure-bhakti-apis"}
+
+@app.get("/health/db")
+async def db_health_check():
+    """Database reachability and connection pool usage (a growing checked_out count points to leaked sessions)"""
+    pool = engine.pool
+    # Read before connecting so the probe's own connection is not counted
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.error(f"Database health check failed: {str(e)}")
+        return ORJSONResponse(status_code=503, content={"status": "unhealthy", "pool": stats})
+    return {"status": "healthy", "pool": stats}
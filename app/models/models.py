@@ -1,103 +1,146 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, BigInteger, Numeric, ForeignKey
-from sqlalchemy.dialects.postgresql import INT4RANGE
-from sqlalchemy.orm import relationship
-from pgvector.sqlalchemy import Vector
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import String, Text, BigInteger, Double, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import INT4RANGE, Range
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from pgvector.sqlalchemy import HALFVEC
 from app.database import Base
 
 
 class Book(Base):
     __tablename__ = "book"
 
-    book_id = Column(Integer, primary_key=True, index=True)
-    pdf_name = Column(String(255), nullable=False, unique=True)
-    original_book_title = Column(String(500), nullable=False)
-    english_book_title = Column(String(500))
-    edition = Column(String(100))
-    number_of_pages = Column(Integer, nullable=False)
-    file_size_bytes = Column(BigInteger)
-    original_author = Column(String(255))
-    commentary_author = Column(String(255))
-    header_height = Column(Numeric(5, 2))
-    footer_height = Column(Numeric(5, 2))
-    created_at = Column(DateTime)
-    updated_at = Column(DateTime)
-    page_label_location = Column(String)
-    toc_pages = Column(INT4RANGE)
-    verse_pages = Column(INT4RANGE)
-    glossary_pages = Column(INT4RANGE)
-    book_summary = Column(Text)
+    book_id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    pdf_name: Mapped[str] = mapped_column(String(255), unique=True)
+    original_book_title: Mapped[str] = mapped_column(String(500))
+    english_book_title: Mapped[Optional[str]] = mapped_column(String(500))
+    edition: Mapped[Optional[str]] = mapped_column(String(100))
+    number_of_pages: Mapped[int]
+    file_size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger)
+    original_author: Mapped[Optional[str]] = mapped_column(String(255))
+    commentary_author: Mapped[Optional[str]] = mapped_column(String(255))
+    header_height: Mapped[Optional[float]] = mapped_column(Double)
+    footer_height: Mapped[Optional[float]] = mapped_column(Double)
+    created_at: Mapped[Optional[datetime]]
+    updated_at: Mapped[Optional[datetime]]
+    page_label_location: Mapped[Optional[str]] = mapped_column(String)
+    toc_pages: Mapped[Optional[Range[int]]] = mapped_column(INT4RANGE)
+    verse_pages: Mapped[Optional[Range[int]]] = mapped_column(INT4RANGE)
+    glossary_pages: Mapped[Optional[Range[int]]] = mapped_column(INT4RANGE)
+    book_summary: Mapped[Optional[str]] = mapped_column(Text)
+
+    # Relationships are never lazy-loaded (here and on every model below): touching one without
+    # an explicit loader option (e.g. selectinload(Book.contents)) raises instead of silently
+    # issuing a query per row. Many-to-one lookups already in the identity map still resolve.
+    contents: Mapped[List["Content"]] = relationship(back_populates="book", lazy="raise_on_sql")
+    glossary_terms: Mapped[List["Glossary"]] = relationship(back_populates="book", lazy="raise_on_sql")
+    page_maps: Mapped[List["PageMap"]] = relationship(back_populates="book", lazy="raise_on_sql")
+    table_of_contents: Mapped[List["TableOfContents"]] = relationship(back_populates="book", lazy="raise_on_sql")
 
 
 class Content(Base):
     __tablename__ = "content"
+    __table_args__ = (
+        # Page fetches and per-book listings ordered by page_number
+        Index("ix_content_book_page", "book_id", "page_number"),
+    )
 
-    content_id = Column(Integer, primary_key=True, index=True)
-    book_id = Column(Integer, ForeignKey("book.book_id"), nullable=False, index=True)
-    page_number = Column(Integer, nullable=False)
-    page_content = Column(Text)
-    ai_page_content = Column(Text)
-    created_at = Column(DateTime)
-    updated_at = Column(DateTime)
+    content_id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    book_id: Mapped[int] = mapped_column(ForeignKey("book.book_id"), index=True)
+    page_number: Mapped[int]
+    page_content: Mapped[Optional[str]] = mapped_column(Text)
+    ai_page_content: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]]
+    updated_at: Mapped[Optional[datetime]]
 
-    book = relationship("Book", back_populates="contents")
+    book: Mapped["Book"] = relationship(back_populates="contents", lazy="raise_on_sql")
 
 
 class Glossary(Base):
     __tablename__ = "glossary"
+    __table_args__ = (
+        # Term lookups within a book
+        Index("ix_glossary_book_term", "book_id", "term"),
+        # Substring (ILIKE '%...%') term search across books; requires the pg_trgm extension
+        Index("ix_glossary_term_trgm", "term", postgresql_using="gin", postgresql_ops={"term": "gin_trgm_ops"}),
+        # Substring search on descriptions (text search fallback)
+        Index("ix_glossary_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+    )
 
-    glossary_id = Column(Integer, primary_key=True, index=True)
-    book_id = Column(Integer, ForeignKey("book.book_id"), nullable=False, index=True)
-    term = Column(String(255), nullable=False)
-    description = Column(Text, nullable=False)
-    created_at = Column(DateTime)
-    updated_at = Column(DateTime)
+    glossary_id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    book_id: Mapped[int] = mapped_column(ForeignKey("book.book_id"), index=True)
+    term: Mapped[str] = mapped_column(String(255))
+    description: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]]
+    updated_at: Mapped[Optional[datetime]]
 
-    book = relationship("Book", back_populates="glossary_terms")
+    book: Mapped["Book"] = relationship(back_populates="glossary_terms", lazy="raise_on_sql")
 
 
 class PageMap(Base):
     __tablename__ = "page_map"
-
-    page_map_id = Column(Integer, primary_key=True, index=True)
-    book_id = Column(Integer, ForeignKey("book.book_id"), nullable=False, index=True)
-    page_number = Column(Integer, nullable=False)
-    page_label = Column(String(100))
-    page_type = Column(String(50), nullable=False, default='Primary')
-    page_header = Column(String(255))
-    created_at = Column(DateTime)
-
-    book = relationship("Book", back_populates="page_maps")
+    __table_args__ = (
+        # Per-book listings in page order; covers the Primary-page fallback for core pages
+        Index("ix_page_map_book_page", "book_id", "page_number", postgresql_include=["page_type", "page_label"]),
+        # Core pages only (core page listing and the "has core pages" check)
+        Index(
+            "ix_page_map_core",
+            "book_id",
+            "page_number",
+            postgresql_include=["page_label"],
+            postgresql_where=text("page_type = 'Core'"),
+        ),
+    )
+
+    page_map_id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    book_id: Mapped[int] = mapped_column(ForeignKey("book.book_id"), index=True)
+    page_number: Mapped[int]
+    page_label: Mapped[Optional[str]] = mapped_column(String(100))
+    page_type: Mapped[str] = mapped_column(String(50), default='Primary')
+    page_header: Mapped[Optional[str]] = mapped_column(String(255))
+    created_at: Mapped[Optional[datetime]]
+
+    book: Mapped["Book"] = relationship(back_populates="page_maps", lazy="raise_on_sql")
 
 
 class TableOfContents(Base):
     __tablename__ = "table_of_contents"
+    __table_args__ = (
+        # Serves the per-book TOC listing (WHERE book_id = ? ORDER BY toc_id)
+        Index("ix_toc_book_order", "book_id", "toc_id"),
+    )
 
-    toc_id = Column(Integer, primary_key=True, index=True)
-    book_id = Column(Integer, ForeignKey("book.book_id"), nullable=False, index=True)
-    parent_toc_id = Column(Integer)
-    toc_level = Column(Integer)
-    toc_label = Column(String(500))
-    page_label = Column(String(100))
-    page_number = Column(Integer)
+    toc_id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    book_id: Mapped[int] = mapped_column(ForeignKey("book.book_id"), index=True)
+    parent_toc_id: Mapped[Optional[int]]
+    toc_level: Mapped[Optional[int]]
+    toc_label: Mapped[Optional[str]] = mapped_column(String(500))
+    page_label: Mapped[Optional[str]] = mapped_column(String(100))
+    page_number: Mapped[Optional[int]]
 
-    book = relationship("Book", back_populates="table_of_contents")
+    book: Mapped["Book"] = relationship(back_populates="table_of_contents", lazy="raise_on_sql")
 
 
 class GlossaryEmbedding(Base):
     __tablename__ = "glossary_embeddings"
-
-    glossary_id = Column(Integer, ForeignKey("glossary.glossary_id", ondelete="CASCADE"), primary_key=True, index=True)
-    book_id = Column(Integer, ForeignKey("book.book_id", ondelete="CASCADE"), nullable=False, index=True)
-    term = Column(String(255), nullable=False)
-    embedding = Column(Vector(1024), nullable=False)
-    created_at = Column(DateTime)
-    updated_at = Column(DateTime)
-
-    book = relationship("Book")
-    glossary = relationship("Glossary")
-
-
-Book.contents = relationship("Content", back_populates="book")
-Book.glossary_terms = relationship("Glossary", back_populates="book")
-Book.page_maps = relationship("PageMap", back_populates="book")
-Book.table_of_contents = relationship("TableOfContents", back_populates="book")
\ No newline at end of file
+    __table_args__ = (
+        # Approximate nearest-neighbour index for cosine distance (<=>); requires pgvector >= 0.7 for halfvec
+        Index(
+            "ix_glossary_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
+        ),
+    )
+
+    glossary_id: Mapped[int] = mapped_column(ForeignKey("glossary.glossary_id", ondelete="CASCADE"), primary_key=True, index=True)
+    book_id: Mapped[int] = mapped_column(ForeignKey("book.book_id", ondelete="CASCADE"), index=True)
+    term: Mapped[str] = mapped_column(String(255))
+    # Half precision halves storage and the bytes read per distance computation
+    embedding: Mapped[List[float]] = mapped_column(HALFVEC(1024))
+    created_at: Mapped[Optional[datetime]]
+    updated_at: Mapped[Optional[datetime]]
+
+    book: Mapped["Book"] = relationship(lazy="raise_on_sql")
+    glossary: Mapped["Glossary"] = relationship(lazy="raise_on_sql")
@@ -1,27 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache.decorator import cache
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import conditional_get
+from app.database import AsyncSessionLocal, get_db
 from app.services.services import BookService, ContentService, GlossaryService, PageMapService, TocService, GlossaryEmbeddingService
-from app.schemas.schemas import Book, BookListResponse, Content, ContentResponse, ContentListResponse, GlossaryWithBook, GlossaryListResponse, GlossaryTermResponse, CorePageInfo, CorePagesResponse, PageMap, FullPageMapResponse, TableOfContents, TocResponse, TocListResponse, SemanticSearchRequest, SemanticSearchResponse, GlossaryEmbeddingWithSimilarity, GlossarySearchRequest, GlossarySearchResponse, GlossarySearchResult
+from app.schemas.schemas import Book, BookListResponse, Content, ContentResponse, ContentListResponse, Glossary, GlossaryWithBook, GlossaryListResponse, GlossaryTermResponse, LegacyGlossarySearchResponse, CompactGlossarySearchResponse, CorePageInfo, CorePagesResponse, PageMap, FullPageMapResponse, TableOfContents, TocResponse, TocListResponse, SemanticSearchRequest, SemanticSearchResponse, GlossaryEmbeddingWithSimilarity, GlossarySearchRequest, GlossarySearchResponse, GlossarySearchResult
 from app.services.ollama_service import ollama_service
 from app.services.content_filter import ContentFilter
+from typing import AsyncIterator, Callable, Optional, Union
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Serializers for uncached list responses. Routes cached with @cache keep returning models
+# so fastapi-cache can encode them and set Cache-Control/ETag on the response.
+content_list_response = TypeAdapter(ContentListResponse)
+glossary_list_response = TypeAdapter(GlossaryListResponse)
+toc_list_response = TypeAdapter(TocListResponse)
+legacy_glossary_search_response = TypeAdapter(LegacyGlossarySearchResponse)
+compact_glossary_search_response = TypeAdapter(CompactGlossarySearchResponse)
+
+
+def json_response(adapter: TypeAdapter, value) -> Response:
+    """Encode with pydantic-core's JSON serializer, skipping FastAPI's response model pass"""
+    return Response(content=adapter.dump_json(value), media_type="application/json")
+
+
+async def books_etag(db: AsyncSession, **_) -> str:
+    """ETag for the book list, changing whenever a book is added, removed or updated"""
+    return f'W/"books-{await BookService.get_books_version(db)}"'
+
+
+async def book_etag(book_id: int, db: AsyncSession, **_) -> Optional[str]:
+    """ETag for book-scoped resources, derived from the book's last update (served from the book cache)"""
+    book = await BookService.get_book_by_id(db, book_id)
+    if book is None:
+        return None
+    changed = book.updated_at or book.created_at
+    return f'W/"book-{book_id}-{changed.timestamp() if changed else 0}"'
+
 
 @router.get("/books", response_model=BookListResponse)
-def get_books(
+@conditional_get(books_etag)
+@cache(expire=300)
+async def get_books(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    after: Optional[int] = Query(None, description="Return books after this book_id instead of by page number"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get list of all books with pagination"""
     skip = (page - 1) * size
-    books = BookService.get_books(db, skip=skip, limit=size)
-    total = BookService.get_books_count(db)
+    books, total = await BookService.get_books_page(db, skip=skip, limit=size, after=after)
 
     return BookListResponse(
         books=books,
@@ -32,25 +68,26 @@ def get_books(
 
 
 @router.get("/books/{book_id}", response_model=Book)
-def get_book(book_id: int, db: Session = Depends(get_db)):
+@conditional_get(book_etag)
+@cache(expire=300)
+async def get_book(book_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific book by book_id"""
-    book = BookService.get_book_by_id(db, book_id)
+    book = await BookService.get_book_by_id(db, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
-    return book
+    # Return the schema rather than the ORM object so the response cache can encode it
+    return Book.model_validate(book)
 
 
 @router.get("/books/{book_id}/content/{page_number}", response_model=ContentResponse)
-def get_page_content(book_id: int, page_number: int, db: Session = Depends(get_db)):
+async def get_page_content(book_id: int, page_number: int, db: AsyncSession = Depends(get_db)):
     """Get page content by book_id and page_number"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
     # Get the content for the specific page
-    content = ContentService.get_page_content(db, book_id, page_number)
+    content = await ContentService.get_page_content(db, book_id, page_number)
     if not content:
+        # Only a miss needs the book existence check
+        if not await BookService.book_exists(db, book_id):
+            raise HTTPException(status_code=404, detail="Book not found")
         return ContentResponse(
             content=None,
             message=f"No content found for book {book_id}, page {page_number}"
@@ -60,141 +97,105 @@ def get_page_content(book_id: int, page_number: int, db: Session = Depends(get_d
 
 
 @router.get("/books/{book_id}/content", response_model=ContentListResponse)
-def get_book_content(
+async def get_book_content(
     book_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    after: Optional[int] = Query(None, description="Return pages after this page_number instead of by page number"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all content for a book with pagination"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
     skip = (page - 1) * size
-    content_list = ContentService.get_book_content(db, book_id, skip=skip, limit=size)
-    total = ContentService.get_book_content_count(db, book_id)
+    content_list, total = await ContentService.get_book_content_page(db, book_id, skip=skip, limit=size, after=after)
 
-    return ContentListResponse(
+    # Rows imply the book exists; only an empty page needs the existence check
+    if not content_list and not await BookService.book_exists(db, book_id):
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    return json_response(content_list_response, ContentListResponse(
         content=content_list,
         total=total,
         page=page,
         size=size,
         book_id=book_id
-    )
+    ))
 
 
 @router.get("/books/{book_id}/glossary/embeddings")
-def get_book_glossary_embeddings(
+async def get_book_glossary_embeddings(
     book_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all glossary embeddings for a specific book (without the actual embedding vectors)"""
-    # Check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
     skip = (page - 1) * size
-    embeddings = GlossaryEmbeddingService.get_embeddings_by_book(db, book_id, skip=skip, limit=size)
-    total = GlossaryEmbeddingService.get_embeddings_count(db, book_id=book_id)
-
-    # Return without the actual embedding vectors for performance
-    results = [
-        {
-            "glossary_id": emb.glossary_id,
-            "book_id": emb.book_id,
-            "term": emb.term,
-            "created_at": emb.created_at,
-            "updated_at": emb.updated_at
-        }
-        for emb in embeddings
-    ]
+    embeddings, total = await GlossaryEmbeddingService.get_embeddings_by_book_page(db, book_id, skip=skip, limit=size)
 
-    return {
-        "embeddings": results,
+    # Rows imply the book exists; only an empty page needs the existence check
+    if not embeddings and not await BookService.book_exists(db, book_id):
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    # Rows are already plain dicts without the embedding vectors; hand them straight to orjson
+    return ORJSONResponse({
+        "embeddings": embeddings,
         "total": total,
         "page": page,
         "size": size,
         "book_id": book_id
-    }
+    })
 
 
 @router.get("/books/{book_id}/glossary", response_model=GlossaryListResponse)
-def get_book_glossary(
+async def get_book_glossary(
     book_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all glossary terms for a book with pagination"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
+    skip = (page - 1) * size
+    glossary_results, total = await GlossaryService.get_book_glossary_terms_page(db, book_id, skip=skip, limit=size)
+
+    # Rows imply the book exists; only an empty page needs the existence check
+    if not glossary_results and not await BookService.book_exists(db, book_id):
         raise HTTPException(status_code=404, detail="Book not found")
 
-    skip = (page - 1) * size
-    glossary_results = GlossaryService.get_book_glossary_terms(db, book_id, skip=skip, limit=size)
-    total = GlossaryService.get_book_glossary_count(db, book_id)
-
-    # Convert query results to GlossaryWithBook objects
-    glossary_terms = []
-    for result in glossary_results:
-        glossary_terms.append(GlossaryWithBook(
-            glossary_id=result.glossary_id,
-            book_id=result.book_id,
-            term=result.term,
-            description=result.description,
-            created_at=result.created_at,
-            updated_at=result.updated_at,
-            book_name=result.book_name
-        ))
+    # Rows already match the schema, so build GlossaryWithBook objects without re-validating
+    glossary_terms = [GlossaryWithBook.model_construct(**row) for row in glossary_results]
 
-    return GlossaryListResponse(
+    return json_response(glossary_list_response, GlossaryListResponse(
         glossary_terms=glossary_terms,
         total=total,
         page=page,
         size=size,
         book_id=book_id
-    )
+    ))
 
 
 @router.get("/books/{book_id}/glossary/{term}", response_model=GlossaryTermResponse)
-def get_glossary_term(book_id: int, term: str, db: Session = Depends(get_db)):
+async def get_glossary_term(book_id: int, term: str, db: AsyncSession = Depends(get_db)):
     """Get description and book name for a specific term in a book"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
     # Get the glossary term
-    result = GlossaryService.get_glossary_term_by_name(db, book_id, term)
+    result = await GlossaryService.get_glossary_term_by_name(db, book_id, term)
     if not result:
+        # Only a miss needs the book existence check
+        if not await BookService.book_exists(db, book_id):
+            raise HTTPException(status_code=404, detail="Book not found")
         return GlossaryTermResponse(
             term=None,
             message=f"No glossary term matching '{term}' found in book {book_id}"
         )
 
-    glossary_term = GlossaryWithBook(
-        glossary_id=result.glossary_id,
-        book_id=result.book_id,
-        term=result.term,
-        description=result.description,
-        created_at=result.created_at,
-        updated_at=result.updated_at,
-        book_name=result.book_name
-    )
+    glossary_term = GlossaryWithBook.model_construct(**result)
 
     return GlossaryTermResponse(term=glossary_term)
 
 
 @router.post("/glossary/search", response_model=GlossarySearchResponse)
-def search_glossary(
+async def search_glossary(
     search_request: GlossarySearchRequest = Body(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Search for glossary terms across all books using semantic search with text fallback.
@@ -221,10 +222,14 @@ def search_glossary(
             detail="Your search query cannot be processed. Please use respectful language appropriate for sacred content."
         )
 
+    # Start embedding the query right away; only the book check below uses the session
+    logger.info(f"Attempting semantic search for: '{query}'")
+    embedding_task = asyncio.create_task(ollama_service.generate_embedding(query))
+
     # Validate book_id if provided
     if book_id is not None:
-        book = BookService.get_book_by_id(db, book_id)
-        if not book:
+        if not await BookService.book_exists(db, book_id):
+            embedding_task.cancel()
             raise HTTPException(status_code=404, detail=f"Book with id {book_id} not found")
 
     results = []
@@ -232,13 +237,12 @@ def search_glossary(
 
     try:
         # Try semantic search first
-        logger.info(f"Attempting semantic search for: '{query}'")
-        embedding = ollama_service.generate_embedding(query)
+        embedding = await embedding_task
 
-        if embedding:
+        if embedding is not None:
             # Semantic search succeeded
             logger.info(f"Embedding generated successfully, searching database...")
-            semantic_results = GlossaryEmbeddingService.semantic_search_all_books(
+            semantic_results = await GlossaryEmbeddingService.semantic_search_all_books(
                 db=db,
                 query_embedding=embedding,
                 limit=limit,
@@ -248,7 +252,7 @@ def search_glossary(
 
             # Convert to response format
             for result in semantic_results:
-                results.append(GlossarySearchResult(
+                results.append(GlossarySearchResult.model_construct(
                     term=result.term,
                     description=result.description,
                     book_name=result.book_name,
@@ -264,11 +268,13 @@ def search_glossary(
     except Exception as e:
         logger.error(f"Semantic search error: {str(e)}, falling back to text search")
         search_method_used = "text"
+        # A failed statement aborts the session's transaction; the fallback needs a fresh one
+        await db.rollback()
 
     # Fallback to text search if semantic search returned no results or failed
     if not results:
         logger.info(f"Using text search fallback for: '{query}'")
-        text_results = GlossaryService.text_search_all_books(
+        text_results = await GlossaryService.text_search_all_books(
             db=db,
             query=query,
             limit=limit,
@@ -276,11 +282,11 @@ def search_glossary(
         )
 
         for result in text_results:
-            results.append(GlossarySearchResult(
-                term=result.term,
-                description=result.description,
-                book_name=result.book_name,
-                book_id=result.book_id
+            results.append(GlossarySearchResult.model_construct(
+                term=result["term"],
+                description=result["description"],
+                book_name=result["book_name"],
+                book_id=result["book_id"]
             ))
 
         logger.info(f"Text search returned {len(results)} results")
@@ -298,61 +304,61 @@ def search_glossary(
     )
 
 
-@router.get("/glossary/search-legacy", response_model=dict)
-def search_glossary_terms_legacy(
+@router.get("/glossary/search-legacy", response_model=Union[LegacyGlossarySearchResponse, CompactGlossarySearchResponse])
+async def search_glossary_terms_legacy(
     term: str = Query(..., description="Term to search for across all books"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    compact: bool = Query(False, description="Return book names once in a `books` map instead of on every term"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Legacy endpoint: Search for a term across all books (text-based only)"""
     skip = (page - 1) * size
-    search_results = GlossaryService.search_terms_across_books(db, term, skip=skip, limit=size)
-
-    # Convert query results to GlossaryWithBook objects
-    glossary_terms = []
-    for result in search_results:
-        glossary_terms.append(GlossaryWithBook(
-            glossary_id=result.glossary_id,
-            book_id=result.book_id,
-            term=result.term,
-            description=result.description,
-            created_at=result.created_at,
-            updated_at=result.updated_at,
-            book_name=result.book_name
+    search_results, total = await GlossaryService.search_terms_across_books_page(db, term, skip=skip, limit=size)
+
+    # Each shape is serialized with its own schema; response_model only documents the two
+    if compact:
+        books = {row["book_id"]: row["book_name"] for row in search_results}
+        glossary_terms = [
+            Glossary.model_construct(**{field: value for field, value in row.items() if field != "book_name"})
+            for row in search_results
+        ]
+        result = json_response(compact_glossary_search_response, CompactGlossarySearchResponse(
+            books=books,
+            glossary_terms=glossary_terms,
+            total=total,
+            page=page,
+            size=size,
+            search_term=term
         ))
-
-    return {
-        "glossary_terms": glossary_terms,
-        "total": len(glossary_terms),
-        "page": page,
-        "size": size,
-        "search_term": term
-    }
+    else:
+        # Rows already match the schema, so build GlossaryWithBook objects without re-validating
+        glossary_terms = [GlossaryWithBook.model_construct(**row) for row in search_results]
+        result = json_response(legacy_glossary_search_response, LegacyGlossarySearchResponse(
+            glossary_terms=glossary_terms,
+            total=total,
+            page=page,
+            size=size,
+            search_term=term
+        ))
+    result.headers["X-Total-Count"] = str(total)
+    return result
 
 
 @router.get("/books/{book_id}/pages/core", response_model=CorePagesResponse)
-def get_core_pages(book_id: int, db: Session = Depends(get_db)):
+@conditional_get(book_etag)
+@cache(expire=300)
+async def get_core_pages(book_id: int, db: AsyncSession = Depends(get_db)):
     """Get all page numbers and labels for Core pages of a book"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
+    # Core pages, falling back to Primary pages when the book has none
+    core_pages = await PageMapService.get_core_or_primary_pages(db, book_id)
 
-    # Try to get Core pages first
-    core_pages = PageMapService.get_core_pages(db, book_id)
-
-    # If no Core pages found, try Primary pages as fallback
-    if not core_pages:
-        core_pages = PageMapService.get_primary_pages(db, book_id)
+    # Only an empty result needs the book existence check
+    if not core_pages and not await BookService.book_exists(db, book_id):
+        raise HTTPException(status_code=404, detail="Book not found")
 
-    # Convert to CorePageInfo objects
-    pages = []
-    for page_map in core_pages:
-        pages.append(CorePageInfo(
-            page_number=page_map.page_number,
-            page_label=page_map.page_label
-        ))
+    # Rows hold exactly the CorePageInfo fields
+    pages = [CorePageInfo.model_construct(**row._mapping) for row in core_pages]
 
     return CorePagesResponse(
         pages=pages,
@@ -361,79 +367,96 @@ def get_core_pages(book_id: int, db: Session = Depends(get_db)):
     )
 
 
-@router.get("/books/{book_id}/pages", response_model=FullPageMapResponse)
-def get_full_page_map(
+async def stream_book_rows(
+    iter_batches: Callable[[AsyncSession, int], AsyncIterator[list]],
     book_id: int,
-    db: Session = Depends(get_db)
-):
-    """Get full page map for a book (all pages, no pagination)"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
+    field: str,
+    envelope: Callable[[int], dict]
+) -> AsyncIterator[bytes]:
+    """
+    Emit a `{field: [rows...], **envelope(total)}` body batch by batch.
 
-    # Get all pages without pagination
-    page_maps = PageMapService.get_all_pages(db, book_id)
-    total = len(page_maps)
+    Reads through its own session rather than the request's: from FastAPI 0.106 yield dependencies are
+    torn down before a StreamingResponse body runs. The first chunk is empty and is consumed by the route,
+    so a missing book raises its 404 before the response starts. The total is only known once every
+    batch has been sent, so the remaining fields follow the list.
+    """
+    async with AsyncSessionLocal() as db:
+        batches = iter_batches(db, book_id)
+        first_batch = await anext(batches, [])
+
+        # Only an empty result needs the book existence check
+        if not first_batch and not await BookService.book_exists(db, book_id):
+            await batches.aclose()
+            raise HTTPException(status_code=404, detail="Book not found")
+        yield b""
+
+        yield b'{"%s":[' % field.encode() + b",".join(orjson.dumps(dict(row)) for row in first_batch)
+        total = len(first_batch)
+        async for batch in batches:
+            if batch:
+                yield (b"," if total else b"") + b",".join(orjson.dumps(dict(row)) for row in batch)
+                total += len(batch)
+    # Splice the envelope's members in after the list: drop its opening brace
+    yield b"]," + orjson.dumps(envelope(total))[1:]
 
-    return FullPageMapResponse(
-        page_maps=page_maps,
-        total=total,
-        page=1,
-        size=total,
-        book_id=book_id
+
+@router.get("/books/{book_id}/pages", response_model=FullPageMapResponse)
+@conditional_get(book_etag)
+async def get_full_page_map(
+    book_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get full page map for a book (all pages, no pagination), streamed as it is read"""
+    body = stream_book_rows(
+        PageMapService.iter_all_pages, book_id, "page_maps",
+        lambda total: {"total": total, "page": 1, "size": total, "book_id": book_id}
     )
+    await anext(body)
+    return StreamingResponse(body, media_type="application/json")
 
 
 @router.get("/books/{book_id}/toc", response_model=TocResponse)
-def get_book_toc(book_id: int, db: Session = Depends(get_db)):
-    """Get table of contents for a book"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
-    # Get the complete table of contents for the book
-    toc_entries = TocService.get_full_book_toc(db, book_id)
-    total = len(toc_entries)
-
-    return TocResponse(
-        table_of_contents=toc_entries,
-        total=total,
-        book_id=book_id
+@conditional_get(book_etag)
+async def get_book_toc(book_id: int, db: AsyncSession = Depends(get_db)):
+    """Get table of contents for a book, streamed as it is read"""
+    body = stream_book_rows(
+        TocService.iter_full_book_toc, book_id, "table_of_contents",
+        lambda total: {"total": total, "book_id": book_id}
     )
+    await anext(body)
+    return StreamingResponse(body, media_type="application/json")
 
 
 @router.get("/books/{book_id}/toc/paginated", response_model=TocListResponse)
-def get_book_toc_paginated(
+async def get_book_toc_paginated(
     book_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(50, ge=1, le=200, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    after: Optional[int] = Query(None, description="Return entries after this toc_id instead of by page number"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get table of contents for a book with pagination"""
-    # First check if book exists
-    book = BookService.get_book_by_id(db, book_id)
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-
     skip = (page - 1) * size
-    toc_entries = TocService.get_book_toc(db, book_id, skip=skip, limit=size)
-    total = TocService.get_book_toc_count(db, book_id)
+    toc_entries, total = await TocService.get_book_toc_page(db, book_id, skip=skip, limit=size, after=after)
+
+    # Rows imply the book exists; only an empty page needs the existence check
+    if not toc_entries and not await BookService.book_exists(db, book_id):
+        raise HTTPException(status_code=404, detail="Book not found")
 
-    return TocListResponse(
+    return json_response(toc_list_response, TocListResponse(
         table_of_contents=toc_entries,
         total=total,
         page=page,
         size=size,
         book_id=book_id
-    )
+    ))
 
 
 @router.post("/glossary/semantic-search", response_model=SemanticSearchResponse)
-def semantic_search_glossary(
+async def semantic_search_glossary(
     search_request: SemanticSearchRequest = Body(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Perform semantic search on glossary terms using vector embeddings.
@@ -461,24 +484,15 @@ def semantic_search_glossary(
 
 
 @router.get("/glossary/embeddings/stats")
-def get_embeddings_stats(db: Session = Depends(get_db)):
+async def get_embeddings_stats(db: AsyncSession = Depends(get_db)):
     """Get statistics about glossary embeddings"""
-    total_embeddings = GlossaryEmbeddingService.get_embeddings_count(db)
-
-    # Get count per book
-    books = BookService.get_books(db, skip=0, limit=1000)
-    book_stats = []
-    for book in books:
-        count = GlossaryEmbeddingService.get_embeddings_count(db, book_id=book.book_id)
-        if count > 0:
-            book_stats.append({
-                "book_id": book.book_id,
-                "book_name": book.original_book_title,
-                "embedding_count": count
-            })
+    # Per-book counts in one aggregate query; every embedding belongs to a book, so they sum to the total
+    book_stats = [dict(row._mapping) for row in await GlossaryEmbeddingService.get_counts_by_book(db)]
+    total_embeddings = sum(stat["embedding_count"] for stat in book_stats)
 
     return {
         "total_embeddings": total_embeddings,
         "books_with_embeddings": len(book_stats),
-        "book_breakdown": book_stats
+        "book_breakdown": book_stats,
+        "query_cache": ollama_service.embedding_cache_stats()
     }
\ No newline at end of file
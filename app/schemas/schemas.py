@@ -1,7 +1,6 @@
 from pydantic import BaseModel, Field, field_serializer
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from datetime import datetime
-from decimal import Decimal
 
 
 class BookBase(BaseModel):
@@ -13,8 +12,8 @@ class BookBase(BaseModel):
     file_size_bytes: Optional[int] = None
     original_author: Optional[str] = Field(None, max_length=255)
     commentary_author: Optional[str] = Field(None, max_length=255)
-    header_height: Optional[Decimal] = None
-    footer_height: Optional[Decimal] = None
+    header_height: Optional[float] = None
+    footer_height: Optional[float] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     page_label_location: Optional[str] = None
@@ -35,6 +34,9 @@ class Book(BookBase):
         """Convert PostgreSQL Range objects to string representation"""
         if value is None:
             return None
+        if isinstance(value, str):
+            # Already serialized (e.g. replayed from the response cache)
+            return value
         if hasattr(value, 'lower') and hasattr(value, 'upper'):
             # PostgreSQL Range object
             return f"{value.lower}-{value.upper}"
@@ -111,6 +113,23 @@ class GlossaryTermResponse(BaseModel):
     message: Optional[str] = None
 
 
+class LegacyGlossarySearchResponse(BaseModel):
+    glossary_terms: List[GlossaryWithBook]
+    total: int
+    page: int
+    size: int
+    search_term: str
+
+
+class CompactGlossarySearchResponse(BaseModel):
+    books: Dict[int, str]  # book_id -> book name, sent once per book instead of on every term
+    glossary_terms: List[Glossary]
+    total: int
+    page: int
+    size: int
+    search_term: str
+
+
 class PageMapBase(BaseModel):
     book_id: int
     page_number: int
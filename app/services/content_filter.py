@@ -2,16 +2,33 @@
 Content filter for Pure Bhakti API
 Protects sacred content from inappropriate queries
 """
-from typing import Tuple, Set
+from typing import Pattern, Tuple, Set
 import re
 import os
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_REPEATED_CHAR_RE = re.compile(r'(.)\1{5,}')  # 6+ repeated characters
+# Neither alphanumeric nor whitespace; \w also admits '_', which str.isalnum() does not
+_SPECIAL_CHAR_RE = re.compile(r'[^\w\s]|_')
+# ASCII bytes that are alphanumeric or whitespace; deleting them leaves only the special characters
+_ASCII_ALNUM_SPACE = bytes(i for i in range(128) if chr(i).isalnum() or chr(i).isspace())
+
+
+def _count_special_chars(text: str) -> int:
+    """Count characters that are neither alphanumeric nor whitespace"""
+    if text.isascii():
+        # One C-level pass; most queries are plain ASCII
+        return len(text.encode('ascii').translate(None, _ASCII_ALNUM_SPACE))
+    # Unicode-aware path (e.g. IAST diacritics)
+    return len(_SPECIAL_CHAR_RE.findall(text))
+
 
 class ContentFilter:
     """Filter inappropriate content from search queries"""
 
     # Cache for loaded blocked words
     _blocked_words_cache: Set[str] = None
+    _blocked_words_re: Pattern = None
 
     @classmethod
     def _load_blocked_words(cls) -> Set[str]:
@@ -50,6 +67,21 @@ class ContentFilter:
         """Get the set of blocked words"""
         return cls._load_blocked_words()
 
+    @classmethod
+    def _get_blocked_words_re(cls) -> Pattern:
+        """
+        Compile the blocked words into one whole-word alternation, so a query is
+        scanned in a single regex pass instead of tokenized and looked up word by word.
+        """
+        if cls._blocked_words_re is None:
+            # Only single-token entries can ever match a whole word; longest first
+            words = sorted((w for w in cls.get_blocked_words() if re.fullmatch(r'\w+', w)), key=len, reverse=True)
+            if words:
+                cls._blocked_words_re = re.compile(r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b')
+            else:
+                cls._blocked_words_re = re.compile(r'(?!)')  # Matches nothing
+        return cls._blocked_words_re
+
     # Additional pattern matching for variations
     BLOCKED_PATTERNS = [
         r'\b(f+u+c+k+)\b',  # Variations with repeated letters
@@ -57,6 +89,7 @@ class ContentFilter:
         r'\b(d+a+m+n+)\b',
         # Add more patterns as needed
     ]
+    _BLOCKED_PATTERNS_RE = re.compile('|'.join(BLOCKED_PATTERNS), re.IGNORECASE)
 
     @classmethod
     def is_appropriate(cls, text: str) -> Tuple[bool, str]:
@@ -77,24 +110,20 @@ class ContentFilter:
         text_lower = text.lower().strip()
 
         # Check against blocked words
-        blocked_words = cls.get_blocked_words()
-        words = re.findall(r'\b\w+\b', text_lower)
-        for word in words:
-            if word in blocked_words:
-                return False, "Query contains inappropriate content"
+        if cls._get_blocked_words_re().search(text_lower):
+            return False, "Query contains inappropriate content"
 
         # Check against blocked patterns
-        for pattern in cls.BLOCKED_PATTERNS:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return False, "Query contains inappropriate content"
+        if cls._BLOCKED_PATTERNS_RE.search(text_lower):
+            return False, "Query contains inappropriate content"
 
         # Check for excessive special characters (spam/abuse)
-        special_char_ratio = sum(not c.isalnum() and not c.isspace() for c in text) / len(text)
+        special_char_ratio = _count_special_chars(text) / len(text)
         if special_char_ratio > 0.3:  # More than 30% special characters
             return False, "Query contains excessive special characters"
 
         # Check for repeated characters (spam)
-        if re.search(r'(.)\1{5,}', text):  # 6+ repeated characters
+        if _REPEATED_CHAR_RE.search(text):
             return False, "Query appears to be spam"
 
         # Query length limits
@@ -121,7 +150,7 @@ class ContentFilter:
             return ""
 
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = _WHITESPACE_RE.sub(' ', text.strip())
 
         # Remove control characters
         text = ''.join(char for char in text if char.isprintable() or char.isspace())
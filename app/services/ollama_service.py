@@ -1,5 +1,11 @@
-import requests
-from typing import List, Optional
+import httpx
+import numpy as np
+import orjson
+import redis.asyncio as redis
+from cachetools import TTLCache
+from typing import List, Optional, Tuple
+import asyncio
+import hashlib
 import logging
 import os
 
@@ -14,8 +20,206 @@ class OllamaService:
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model = model
         self.embeddings_url = f"{self.base_url}/api/embeddings"
+        self.embed_url = f"{self.base_url}/api/embed"  # Batch endpoint (Ollama >= 0.3)
 
-    def generate_embedding(self, text: str, timeout: int = 10) -> Optional[List[float]]:
+        # Exact-match cache of query text -> embedding
+        self._exact_cache: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+        self._cache_stats = {"exact_hits": 0, "shared_hits": 0, "misses": 0}
+
+        # Shared keep-alive client, opened in the app lifespan (or lazily on first use)
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Optional Redis tier shared by all workers and surviving restarts
+        self._redis: Optional[redis.Redis] = None
+        self.shared_cache_ttl = 86400
+
+        # Micro-batching: requests arriving within batch_window seconds share one Ollama call
+        self.batch_window = 0.01
+        self.max_batch_size = 32
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self._batch_supported = True
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=10,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+        return self._client
+
+    async def start(self, redis_url: Optional[str] = None):
+        """Open the pooled HTTP client, the request batcher and, when configured, the shared Redis cache"""
+        self._get_client()
+        if redis_url and self._redis is None:
+            self._redis = redis.from_url(redis_url)
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._run_batcher())
+
+    async def close(self):
+        """Stop batching and close the pooled HTTP client and Redis connection"""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+            for task in list(self._inflight):
+                task.cancel()
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_result(None)
+            self._queue = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _cache_key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self.model}\0{text}".encode(), digest_size=16).digest()
+
+    def _shared_key(self, key: bytes) -> str:
+        return f"emb:{self.model}:{key.hex()}"
+
+    async def _get_shared(self, key: bytes) -> Optional[np.ndarray]:
+        """Look an embedding up in Redis; any Redis failure is treated as a miss"""
+        if self._redis is None:
+            return None
+        try:
+            data = await self._redis.get(self._shared_key(key))
+        except Exception as e:
+            logger.warning(f"Shared embedding cache unavailable: {str(e)}")
+            return None
+        if data is None:
+            return None
+        return np.frombuffer(data, dtype=np.float32)
+
+    async def _set_shared(self, key: bytes, embedding: np.ndarray):
+        """Store an embedding in Redis as raw float32 bytes"""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(self._shared_key(key), self.shared_cache_ttl, embedding.tobytes())
+        except Exception as e:
+            logger.warning(f"Could not write to shared embedding cache: {str(e)}")
+
+    async def generate_embedding(self, text: str, timeout: int = 10) -> Optional[np.ndarray]:
+        """
+        Generate embedding vector for given text, reusing cached embeddings where possible.
+
+        Args:
+            text: Input text to generate embedding for
+            timeout: Request timeout in seconds
+
+        Returns:
+            float32 array holding the embedding vector, or None if failed
+        """
+        key = self._cache_key(text)
+        cached = self._exact_cache.get(key)
+        if cached is not None:
+            self._cache_stats["exact_hits"] += 1
+            return cached
+
+        embedding = await self._get_shared(key)
+        if embedding is not None:
+            self._cache_stats["shared_hits"] += 1
+            self._exact_cache[key] = embedding
+            return embedding
+
+        embedding = await self._submit(text, timeout)
+        if embedding is None:
+            return None
+
+        self._cache_stats["misses"] += 1
+        self._exact_cache[key] = embedding
+        await self._set_shared(key, embedding)
+        return embedding
+
+    def embedding_cache_stats(self) -> dict:
+        """Hit/miss counters and current sizes of the embedding caches"""
+        return {
+            **self._cache_stats,
+            "exact_entries": len(self._exact_cache),
+        }
+
+    async def _submit(self, text: str, timeout: int) -> Optional[np.ndarray]:
+        """Queue a text for the next batch, or call Ollama directly when the batcher is not running"""
+        if self._batcher is None:
+            return await self._request_embedding(text, timeout)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run_batcher(self):
+        """Collect queued texts for up to batch_window seconds (or max_batch_size items) per batch"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Send without blocking collection of the next batch
+            task = asyncio.create_task(self._embed_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _embed_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            embeddings = dict(zip(texts, await self._request_embeddings(texts)))
+        except Exception as e:
+            logger.error(f"Unexpected error generating batch embeddings: {str(e)}")
+            embeddings = {}
+        for text, future in batch:
+            if not future.done():
+                future.set_result(embeddings.get(text))
+
+    async def _request_embeddings(self, texts: List[str], timeout: int = 10) -> List[Optional[np.ndarray]]:
+        """
+        Generate embeddings for several texts in one Ollama call.
+
+        Falls back to one /api/embeddings call per text on Ollama versions without /api/embed.
+        """
+        if len(texts) == 1 or not self._batch_supported:
+            return list(await asyncio.gather(*(self._request_embedding(text, timeout) for text in texts)))
+
+        try:
+            response = await self._get_client().post(
+                self.embed_url,
+                json={"model": self.model, "input": texts},
+                timeout=timeout
+            )
+
+            if response.status_code == 200:
+                embeddings = orjson.loads(response.content).get("embeddings")
+                if isinstance(embeddings, list) and len(embeddings) == len(texts):
+                    logger.info(f"Generated {len(texts)} embeddings in one batch")
+                    return list(np.asarray(embeddings, dtype=np.float32))
+                logger.error("Invalid batch embedding format received from Ollama")
+                return [None] * len(texts)
+            if response.status_code == 404:
+                logger.warning("Ollama has no /api/embed endpoint; embedding texts one at a time")
+                self._batch_supported = False
+                return await self._request_embeddings(texts, timeout)
+            logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+            return [None] * len(texts)
+
+        except httpx.TimeoutException:
+            logger.error(f"Ollama batch request timed out after {timeout} seconds")
+            return [None] * len(texts)
+        except httpx.ConnectError:
+            logger.error("Failed to connect to Ollama service. Is it running on localhost:11434?")
+            return [None] * len(texts)
+
+    async def _request_embedding(self, text: str, timeout: int) -> Optional[np.ndarray]:
         """
         Generate embedding vector for given text using Ollama.
 
@@ -24,7 +228,7 @@ class OllamaService:
             timeout: Request timeout in seconds
 
         Returns:
-            List of floats representing the embedding vector, or None if failed
+            float32 array holding the embedding vector, or None if failed
         """
         try:
             payload = {
@@ -32,19 +236,19 @@ class OllamaService:
                 "prompt": text
             }
 
-            response = requests.post(
+            response = await self._get_client().post(
                 self.embeddings_url,
                 json=payload,
                 timeout=timeout
             )
 
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 embedding = result.get("embedding")
 
                 if embedding and isinstance(embedding, list):
                     logger.info(f"Generated embedding for query: '{text[:50]}...' (dim: {len(embedding)})")
-                    return embedding
+                    return np.asarray(embedding, dtype=np.float32)
                 else:
                     logger.error(f"Invalid embedding format received from Ollama: {result}")
                     return None
@@ -52,20 +256,20 @@ class OllamaService:
                 logger.error(f"Ollama API error: {response.status_code} - {response.text}")
                 return None
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error(f"Ollama request timed out after {timeout} seconds")
             return None
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             logger.error("Failed to connect to Ollama service. Is it running on localhost:11434?")
             return None
         except Exception as e:
             logger.error(f"Unexpected error generating embedding: {str(e)}")
             return None
 
-    def health_check(self) -> bool:
+    async def health_check(self) -> bool:
         """Check if Ollama service is available"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = await self._get_client().get(f"{self.base_url}/api/tags", timeout=2)
             return response.status_code == 200
         except:
             return False
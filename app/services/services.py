@@ -1,113 +1,299 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, text
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, and_, bindparam, cast, exists, func, literal_column, or_, select, text, union_all
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from pgvector.sqlalchemy import HALFVEC, VECTOR
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+import asyncio
+import numpy as np
+import orjson
+from app.database import AsyncSessionLocal
 from app.models.models import Book, Content, Glossary, PageMap, TableOfContents, GlossaryEmbedding
+from app.cache import book_cache, book_exists_cache, books_version_cache, cached
+from app.config import get_settings
+from app.services.term_index import glossary_term_index
+
+T = TypeVar("T")
+
+
+async def _fetch_page(db: AsyncSession, query: Select, skip: int) -> Tuple[list, int]:
+    """
+    Run a paginated query with a windowed total so rows and count come back in one round-trip.
+
+    Each returned row carries an extra `total` column. A page past the end returns no rows
+    (and so no total), in which case the count is fetched separately.
+    """
+    result = await db.execute(query.add_columns(func.count().over().label('total')))
+    rows = result.all()
+    if rows:
+        return rows, rows[0].total
+    if skip == 0:
+        return rows, 0
+    count_query = select(func.count()).select_from(query.order_by(None).offset(None).limit(None).subquery())
+    return rows, await db.scalar(count_query)
+
+
+async def _in_own_session(query: Callable[..., Awaitable[T]], *args) -> T:
+    """
+    Run a service query on a session of its own, so it can be awaited concurrently with a
+    query on the request session (one AsyncSession cannot run two statements at once).
+
+    Meant for @cached queries: a session only checks out a connection when it executes, so
+    a cache hit costs no connection, and single-flight misses add at most one per key.
+    """
+    async with AsyncSessionLocal() as db:
+        return await query(db, *args)
+
+
+async def _set_hnsw_ef_search(db: AsyncSession):
+    """Set the HNSW candidate list size for the current transaction (higher = better recall, slower)"""
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(get_settings().hnsw_ef_search)}"))
+
+
+def _vector_literal(embedding) -> str:
+    """The pgvector text literal ([x,y,...]) for an embedding, memoized on its float32 bytes"""
+    return _encode_vector(np.asarray(embedding, dtype=np.float32).tobytes())
+
+
+@lru_cache(maxsize=256)
+def _encode_vector(data: bytes) -> str:
+    # Rendered in C by orjson rather than formatting each float in Python
+    return orjson.dumps(np.frombuffer(data, dtype=np.float32), option=orjson.OPT_SERIALIZE_NUMPY).decode()
 
 
 class BookService:
     @staticmethod
-    def get_books(db: Session, skip: int = 0, limit: int = 100) -> List[Book]:
+    async def get_books(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Book]:
         """Get list of books with pagination"""
-        return db.query(Book).offset(skip).limit(limit).all()
+        result = await db.scalars(select(Book).offset(skip).limit(limit))
+        return result.all()
+
+    @staticmethod
+    async def get_books_page(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None) -> Tuple[List[Book], int]:
+        """
+        Get a page of books (by book_id) together with the total book count.
+
+        With `after`, returns the books following that book_id (keyset pagination) instead of skipping rows.
+        """
+        query = select(Book).order_by(Book.book_id).limit(limit)
+        if after is not None:
+            # The (cached) total runs alongside the page on its own session
+            books, total = await asyncio.gather(
+                db.scalars(query.where(Book.book_id > after)),
+                _in_own_session(BookService.get_books_count)
+            )
+            return books.all(), total
+        rows, total = await _fetch_page(db, query.offset(skip), skip)
+        return [row.Book for row in rows], total
+
+    @staticmethod
+    async def get_book_by_id(db: AsyncSession, book_id: int) -> Optional[Book]:
+        """Get a specific book by book_id, serving recently loaded books from memory"""
+        book = book_cache.get(book_id)
+        if book is not None:
+            return book
+        book = await db.scalar(select(Book).where(Book.book_id == book_id).limit(1))
+        if book is not None:
+            # Detach so the cached instance is never tied to (or refreshed by) another session
+            db.expunge(book)
+            book_cache[book_id] = book
+            book_exists_cache[book_id] = True
+        return book
+
+    @staticmethod
+    async def get_books_by_ids(db: AsyncSession, book_ids: Iterable[int]) -> Dict[int, Book]:
+        """Get several books as a book_id -> Book map, loading any not in the book cache with one IN query"""
+        books = {}
+        missing = []
+        for book_id in set(book_ids):
+            book = book_cache.get(book_id)
+            if book is not None:
+                books[book_id] = book
+            else:
+                missing.append(book_id)
+        if missing:
+            for book in await db.scalars(select(Book).where(Book.book_id.in_(missing))):
+                db.expunge(book)
+                book_cache[book.book_id] = book
+                book_exists_cache[book.book_id] = True
+                books[book.book_id] = book
+        return books
 
     @staticmethod
-    def get_book_by_id(db: Session, book_id: int) -> Optional[Book]:
-        """Get a specific book by book_id"""
-        return db.query(Book).filter(Book.book_id == book_id).first()
+    async def book_exists(db: AsyncSession, book_id: int) -> bool:
+        """Check whether a book exists, skipping the database for recently seen books"""
+        if book_id in book_exists_cache:
+            return True
+        exists = await db.scalar(select(Book.book_id).where(Book.book_id == book_id)) is not None
+        if exists:
+            book_exists_cache[book_id] = True
+        return exists
 
     @staticmethod
-    def get_books_count(db: Session) -> int:
+    async def get_books_version(db: AsyncSession) -> str:
+        """Fingerprint of the book table (row count and latest change), cached briefly"""
+        version = books_version_cache.get("books")
+        if version is None:
+            count, latest = (await db.execute(select(
+                func.count(Book.book_id),
+                func.max(func.coalesce(Book.updated_at, Book.created_at))
+            ))).one()
+            version = f"{count}-{latest.timestamp() if latest else 0}"
+            books_version_cache["books"] = version
+        return version
+
+    @staticmethod
+    @cached()
+    async def get_books_count(db: AsyncSession) -> int:
         """Get total count of books"""
-        return db.query(func.count(Book.book_id)).scalar()
+        return await db.scalar(select(func.count(Book.book_id)))
 
 
 class ContentService:
     @staticmethod
-    def get_page_content(db: Session, book_id: int, page_number: int) -> Optional[Content]:
+    async def get_page_content(db: AsyncSession, book_id: int, page_number: int) -> Optional[Content]:
         """Get page content by book_id and page_number"""
-        return db.query(Content).filter(
+        return await db.scalar(select(Content).where(
             Content.book_id == book_id,
             Content.page_number == page_number
-        ).first()
+        ).limit(1))
 
     @staticmethod
-    def get_book_content(db: Session, book_id: int, skip: int = 0, limit: int = 100) -> List[Content]:
+    async def get_book_content(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100) -> List[Content]:
         """Get all content for a book with pagination"""
-        return db.query(Content).filter(
+        result = await db.scalars(select(Content).where(
             Content.book_id == book_id
-        ).order_by(Content.page_number).offset(skip).limit(limit).all()
+        ).order_by(Content.page_number).offset(skip).limit(limit))
+        return result.all()
 
     @staticmethod
-    def get_book_content_count(db: Session, book_id: int) -> int:
+    async def get_book_content_page(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100, after: Optional[int] = None) -> Tuple[List[Content], int]:
+        """
+        Get a page of content for a book together with the total page count.
+
+        With `after`, returns the pages following that page_number (keyset pagination) instead of skipping rows.
+        """
+        query = select(Content).where(
+            Content.book_id == book_id
+        ).order_by(Content.page_number).limit(limit)
+        if after is not None:
+            content, total = await asyncio.gather(
+                db.scalars(query.where(Content.page_number > after)),
+                _in_own_session(ContentService.get_book_content_count, book_id)
+            )
+            return content.all(), total
+        rows, total = await _fetch_page(db, query.offset(skip), skip)
+        return [row.Content for row in rows], total
+
+    @staticmethod
+    @cached()
+    async def get_book_content_count(db: AsyncSession, book_id: int) -> int:
         """Get total count of content pages for a book"""
-        return db.query(func.count(Content.content_id)).filter(
+        return await db.scalar(select(func.count(Content.content_id)).where(
             Content.book_id == book_id
-        ).scalar()
+        ))
+
+
+# Glossary columns returned alongside the book name
+GLOSSARY_FIELDS = ("glossary_id", "book_id", "term", "description", "created_at", "updated_at")
+
+
+async def _with_book_names(db: AsyncSession, rows: list) -> List[dict]:
+    """
+    Turn glossary rows (GLOSSARY_FIELDS) into dicts carrying their book's title.
+
+    Titles come from the cached Books rather than a join, so they are not repeated on
+    every row coming back from Postgres.
+    """
+    if not rows:
+        return []
+    books = await BookService.get_books_by_ids(db, [row.book_id for row in rows])
+    return [
+        dict(zip(GLOSSARY_FIELDS, row), book_name=books[row.book_id].original_book_title if row.book_id in books else None)
+        for row in rows
+    ]
 
 
 class GlossaryService:
     @staticmethod
-    def get_book_glossary_terms(db: Session, book_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all glossary terms for a book with book name (joined with book table)"""
-        return db.query(
-            Glossary.glossary_id,
-            Glossary.book_id,
-            Glossary.term,
-            Glossary.description,
-            Glossary.created_at,
-            Glossary.updated_at,
-            Book.original_book_title.label('book_name')
-        ).join(Book, Glossary.book_id == Book.book_id).filter(
+    async def get_book_glossary_terms(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
+        """Get all glossary terms for a book with book name"""
+        result = await db.execute(select(
+            *(getattr(Glossary, field) for field in GLOSSARY_FIELDS)
+        ).where(
+            Glossary.book_id == book_id
+        ).order_by(Glossary.term).offset(skip).limit(limit))
+        return await _with_book_names(db, result.all())
+
+    @staticmethod
+    async def get_book_glossary_terms_page(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100) -> Tuple[List[dict], int]:
+        """Get a page of glossary terms for a book (with book name) together with the total term count"""
+        rows, total = await _fetch_page(db, select(
+            *(getattr(Glossary, field) for field in GLOSSARY_FIELDS)
+        ).where(
             Glossary.book_id == book_id
-        ).order_by(Glossary.term).offset(skip).limit(limit).all()
+        ).order_by(Glossary.term).offset(skip).limit(limit), skip)
+        return await _with_book_names(db, rows), total
 
     @staticmethod
-    def get_glossary_term_by_name(db: Session, book_id: int, term: str) -> Optional[dict]:
+    async def get_glossary_term_by_name(db: AsyncSession, book_id: int, term: str) -> Optional[dict]:
         """Get specific glossary term with book name"""
-        return db.query(
-            Glossary.glossary_id,
-            Glossary.book_id,
-            Glossary.term,
-            Glossary.description,
-            Glossary.created_at,
-            Glossary.updated_at,
-            Book.original_book_title.label('book_name')
-        ).join(Book, Glossary.book_id == Book.book_id).filter(
+        result = await db.execute(select(
+            *(getattr(Glossary, field) for field in GLOSSARY_FIELDS)
+        ).where(
             Glossary.book_id == book_id,
             Glossary.term.ilike(f"%{term}%")
-        ).first()
+        ).limit(1))
+        rows = await _with_book_names(db, result.all())
+        return rows[0] if rows else None
 
     @staticmethod
-    def get_book_glossary_count(db: Session, book_id: int) -> int:
+    @cached()
+    async def get_book_glossary_count(db: AsyncSession, book_id: int) -> int:
         """Get total count of glossary terms for a book"""
-        return db.query(func.count(Glossary.glossary_id)).filter(
+        return await db.scalar(select(func.count(Glossary.glossary_id)).where(
             Glossary.book_id == book_id
-        ).scalar()
+        ))
 
     @staticmethod
-    def search_terms_across_books(db: Session, term: str, skip: int = 0, limit: int = 100) -> List[dict]:
+    async def search_terms_across_books(db: AsyncSession, term: str, skip: int = 0, limit: int = 100) -> List[dict]:
         """Search for a term across all books"""
-        return db.query(
-            Glossary.glossary_id,
-            Glossary.book_id,
-            Glossary.term,
-            Glossary.description,
-            Glossary.created_at,
-            Glossary.updated_at,
-            Book.original_book_title.label('book_name')
-        ).join(Book, Glossary.book_id == Book.book_id).filter(
+        result = await db.execute(
+            GlossaryService._across_books_query(term).offset(skip).limit(limit)
+        )
+        return await _with_book_names(db, result.all())
+
+    @staticmethod
+    async def search_terms_across_books_page(db: AsyncSession, term: str, skip: int = 0, limit: int = 100) -> Tuple[List[dict], int]:
+        """Search for a term across all books, returning a page of matches and the total match count"""
+        rows, total = await _fetch_page(
+            db, GlossaryService._across_books_query(term).offset(skip).limit(limit), skip
+        )
+        return await _with_book_names(db, rows), total
+
+    @staticmethod
+    def _across_books_query(term: str) -> Select:
+        # Book is joined only to order by title; the titles themselves come from the book cache
+        return select(*(getattr(Glossary, field) for field in GLOSSARY_FIELDS)).join(
+            Book, Glossary.book_id == Book.book_id
+        ).where(
             Glossary.term.ilike(f"%{term}%")
-        ).order_by(Book.original_book_title, Glossary.term).offset(skip).limit(limit).all()
+        ).order_by(Book.original_book_title, Glossary.term)
 
     @staticmethod
-    def text_search_all_books(
-        db: Session,
+    async def text_search_all_books(
+        db: AsyncSession,
         query: str,
         limit: int = 5,
         book_id: Optional[int] = None
     ) -> List[dict]:
         """
-        Fallback text search across all books using ILIKE on term and description.
+        Fallback text search across all books.
+
+        Exact and prefix term matches are resolved through the in-memory term index and
+        come first; any remaining slots are filled by ILIKE on term and description (term
+        matches first), unless the index shows the query cannot occur in either.
 
         Args:
             db: Database session
@@ -118,103 +304,289 @@ class GlossaryService:
         Returns:
             List of dictionaries with term, description, book_name, book_id
         """
-        # Build base query
-        base_query = db.query(
-            Glossary.glossary_id,
-            Glossary.book_id,
-            Glossary.term,
-            Glossary.description,
-            Book.original_book_title.label('book_name')
-        ).join(Book, Glossary.book_id == Book.book_id)
+        # Build base query; book names are attached from the book cache afterwards
+        base_query = select(*(getattr(Glossary, field) for field in GLOSSARY_FIELDS))
 
         # Apply book_id filter if provided
         if book_id is not None:
-            base_query = base_query.filter(Glossary.book_id == book_id)
-
-        # Search in both term and description
+            base_query = base_query.where(Glossary.book_id == book_id)
+
+        # Exact/prefix term hits only need a primary key lookup
+        rows = []
+        glossary_ids = glossary_term_index.lookup(query, book_id=book_id)[:limit]
+        if glossary_ids:
+            results = await db.execute(base_query.where(Glossary.glossary_id.in_(glossary_ids)))
+            rows_by_id = {row.glossary_id: row for row in results}
+            rows = [rows_by_id[glossary_id] for glossary_id in glossary_ids if glossary_id in rows_by_id]
+            if len(rows) >= limit:
+                return await _with_book_names(db, rows)
+            # Top up with substring and description matches, skipping the hits already found
+            base_query = base_query.where(Glossary.glossary_id.notin_([row.glossary_id for row in rows]))
+
+        # Skip the scan when some trigram of the query appears in no term or description
+        if not rows and not glossary_term_index.may_contain(query):
+            return []
+
+        # Search in both term and description: term matches rank first, then description-only
+        # matches. Each branch filters on one trigram-indexed column and they never overlap.
         search_pattern = f"%{query}%"
-        results = base_query.filter(
-            (Glossary.term.ilike(search_pattern)) |
-            (Glossary.description.ilike(search_pattern))
-        ).order_by(Glossary.term).limit(limit).all()
+        ranked = union_all(
+            base_query.add_columns(literal_column("1").label('rank')).where(
+                Glossary.term.ilike(search_pattern)
+            ),
+            base_query.add_columns(literal_column("2").label('rank')).where(
+                Glossary.description.ilike(search_pattern),
+                ~Glossary.term.ilike(search_pattern)
+            )
+        ).subquery()
+        results = await db.execute(
+            select(ranked).order_by(ranked.c.rank, ranked.c.term).limit(limit - len(rows))
+        )
 
-        return results
+        return await _with_book_names(db, rows + results.all())
 
 
 class PageMapService:
     @staticmethod
-    def get_core_pages(db: Session, book_id: int) -> List[PageMap]:
+    async def get_core_pages(db: AsyncSession, book_id: int) -> List[PageMap]:
         """Get all page numbers and labels for Core pages of a book"""
-        return db.query(PageMap).filter(
+        result = await db.scalars(select(PageMap).where(
             PageMap.book_id == book_id,
             PageMap.page_type == 'Core'
-        ).order_by(PageMap.page_number).all()
+        ).order_by(PageMap.page_number))
+        return result.all()
 
     @staticmethod
-    def get_primary_pages(db: Session, book_id: int) -> List[PageMap]:
+    async def get_primary_pages(db: AsyncSession, book_id: int) -> List[PageMap]:
         """Get all page numbers and labels for Primary pages of a book (fallback if no Core pages)"""
-        return db.query(PageMap).filter(
+        result = await db.scalars(select(PageMap).where(
             PageMap.book_id == book_id,
             PageMap.page_type == 'Primary'
-        ).order_by(PageMap.page_number).all()
+        ).order_by(PageMap.page_number))
+        return result.all()
+
+    @staticmethod
+    async def get_core_or_primary_pages(db: AsyncSession, book_id: int) -> List[dict]:
+        """
+        Get page numbers and labels of the Core pages of a book, or of its Primary pages
+        if it has no Core pages, in one query
+        """
+        core = aliased(PageMap)
+        has_core_pages = exists().where(core.book_id == book_id, core.page_type == 'Core')
+        result = await db.execute(select(PageMap.page_number, PageMap.page_label).where(
+            PageMap.book_id == book_id,
+            or_(
+                PageMap.page_type == 'Core',
+                and_(PageMap.page_type == 'Primary', ~has_core_pages)
+            )
+        ).order_by(PageMap.page_number))
+        return result.all()
 
     @staticmethod
-    def get_full_page_map(db: Session, book_id: int, skip: int = 0, limit: int = 100) -> List[PageMap]:
+    async def get_full_page_map(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100) -> List[PageMap]:
         """Get full page map for a book with pagination"""
-        return db.query(PageMap).filter(
+        result = await db.scalars(select(PageMap).where(
             PageMap.book_id == book_id
-        ).order_by(PageMap.page_number).offset(skip).limit(limit).all()
+        ).order_by(PageMap.page_number).offset(skip).limit(limit))
+        return result.all()
 
     @staticmethod
-    def get_page_map_count(db: Session, book_id: int) -> int:
+    @cached()
+    async def get_page_map_count(db: AsyncSession, book_id: int) -> int:
         """Get total count of page map entries for a book"""
-        return db.query(func.count(PageMap.page_map_id)).filter(
+        return await db.scalar(select(func.count(PageMap.page_map_id)).where(
             PageMap.book_id == book_id
-        ).scalar()
+        ))
 
     @staticmethod
-    def get_core_pages_count(db: Session, book_id: int) -> int:
+    @cached()
+    async def get_core_pages_count(db: AsyncSession, book_id: int) -> int:
         """Get count of Core pages for a book"""
-        return db.query(func.count(PageMap.page_map_id)).filter(
+        return await db.scalar(select(func.count(PageMap.page_map_id)).where(
             PageMap.book_id == book_id,
             PageMap.page_type == 'Core'
-        ).scalar()
+        ))
 
     @staticmethod
-    def get_all_pages(db: Session, book_id: int) -> List[PageMap]:
+    async def get_all_pages(db: AsyncSession, book_id: int) -> List[PageMap]:
         """Get all pages for a book without pagination"""
-        return db.query(PageMap).filter(
+        result = await db.scalars(select(PageMap).where(
+            PageMap.book_id == book_id
+        ).order_by(PageMap.page_number))
+        return result.all()
+
+    @staticmethod
+    async def iter_all_pages(db: AsyncSession, book_id: int, batch_size: int = 500) -> AsyncIterator[list]:
+        """Stream all pages for a book as batches of row mappings from a server-side cursor"""
+        result = await db.stream(select(
+            PageMap.book_id,
+            PageMap.page_number,
+            PageMap.page_label,
+            PageMap.page_type,
+            PageMap.page_header,
+            PageMap.created_at,
+            PageMap.page_map_id
+        ).where(
             PageMap.book_id == book_id
-        ).order_by(PageMap.page_number).all()
+        ).order_by(PageMap.page_number).execution_options(yield_per=batch_size))
+        async for batch in result.mappings().partitions():
+            yield batch
 
 
 class TocService:
     @staticmethod
-    def get_book_toc(db: Session, book_id: int, skip: int = 0, limit: int = 100) -> List[TableOfContents]:
+    async def get_book_toc(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100) -> List[TableOfContents]:
         """Get table of contents for a book with pagination"""
-        return db.query(TableOfContents).filter(
+        result = await db.scalars(select(TableOfContents).where(
             TableOfContents.book_id == book_id
-        ).order_by(TableOfContents.toc_id).offset(skip).limit(limit).all()
+        ).order_by(TableOfContents.toc_id).offset(skip).limit(limit))
+        return result.all()
 
     @staticmethod
-    def get_book_toc_count(db: Session, book_id: int) -> int:
+    async def get_book_toc_page(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100, after: Optional[int] = None) -> Tuple[List[TableOfContents], int]:
+        """
+        Get a page of table of contents entries together with the total entry count.
+
+        With `after`, returns the entries following that toc_id (keyset pagination) instead of skipping rows.
+        """
+        query = select(TableOfContents).where(
+            TableOfContents.book_id == book_id
+        ).order_by(TableOfContents.toc_id).limit(limit)
+        if after is not None:
+            toc_entries, total = await asyncio.gather(
+                db.scalars(query.where(TableOfContents.toc_id > after)),
+                _in_own_session(TocService.get_book_toc_count, book_id)
+            )
+            return toc_entries.all(), total
+        rows, total = await _fetch_page(db, query.offset(skip), skip)
+        return [row.TableOfContents for row in rows], total
+
+    @staticmethod
+    @cached()
+    async def get_book_toc_count(db: AsyncSession, book_id: int) -> int:
         """Get total count of table of contents entries for a book"""
-        return db.query(func.count(TableOfContents.toc_id)).filter(
+        return await db.scalar(select(func.count(TableOfContents.toc_id)).where(
             TableOfContents.book_id == book_id
-        ).scalar()
+        ))
 
     @staticmethod
-    def get_full_book_toc(db: Session, book_id: int) -> List[TableOfContents]:
+    async def get_full_book_toc(db: AsyncSession, book_id: int) -> List[TableOfContents]:
         """Get complete table of contents for a book without pagination"""
-        return db.query(TableOfContents).filter(
+        result = await db.scalars(select(TableOfContents).where(
+            TableOfContents.book_id == book_id
+        ).order_by(TableOfContents.toc_id))
+        return result.all()
+
+    @staticmethod
+    async def iter_full_book_toc(db: AsyncSession, book_id: int, batch_size: int = 500) -> AsyncIterator[list]:
+        """Stream the complete table of contents for a book as batches of row mappings from a server-side cursor"""
+        result = await db.stream(select(
+            TableOfContents.book_id,
+            TableOfContents.parent_toc_id,
+            TableOfContents.toc_level,
+            TableOfContents.toc_label,
+            TableOfContents.page_label,
+            TableOfContents.page_number,
+            TableOfContents.toc_id
+        ).where(
             TableOfContents.book_id == book_id
-        ).order_by(TableOfContents.toc_id).all()
+        ).order_by(TableOfContents.toc_id).execution_options(yield_per=batch_size))
+        async for batch in result.mappings().partitions():
+            yield batch
+
+
+# Embedding columns worth returning to clients; the 1024-dim vectors are never needed
+EMBEDDING_SUMMARY_FIELDS = ("glossary_id", "book_id", "term", "created_at", "updated_at")
+
+# Column types glossary_embeddings.embedding can have. Migration 006 (pgvector >= 0.7) turns
+# vector into halfvec; <=> has no mixed vector/halfvec form, so query vectors are cast to
+# whichever type the connected database stores (see detect_embedding_type).
+EMBEDDING_TYPES = {"vector": VECTOR, "halfvec": HALFVEC}
+_embedding_type = "halfvec"
+
+
+async def detect_embedding_type(db: AsyncSession) -> str:
+    """
+    Read the stored type of glossary_embeddings.embedding and cast query vectors to it.
+
+    Raises ValueError for a type semantic search cannot query.
+    """
+    global _embedding_type
+    column_type = await db.scalar(text(
+        "SELECT format_type(atttypid, NULL) FROM pg_attribute "
+        "WHERE attrelid = 'glossary_embeddings'::regclass AND attname = 'embedding'"
+    ))
+    if column_type not in EMBEDDING_TYPES:
+        raise ValueError(f"glossary_embeddings.embedding has unsupported type {column_type!r}")
+    _embedding_type = column_type
+    return column_type
+
+
+# Nearest embeddings overall, found through the HNSW index
+NEAREST_SQL = """
+    SELECT
+        ge.glossary_id,
+        ge.book_id,
+        ge.term,
+        ge.embedding <=> CAST(:embedding AS {embedding_type}) as distance
+    FROM glossary_embeddings ge
+    ORDER BY distance
+    LIMIT :limit
+"""
+
+# Nearest embeddings within one book, by exact search. The HNSW scan yields only ~ef_search
+# candidates overall, and filtering those by book can leave fewer than `limit` (or none).
+# OFFSET 0 keeps the book's rows in their own subquery, so the planner reads them through
+# the book_id index and sorts instead of ordering through HNSW.
+NEAREST_IN_BOOK_SQL = """
+    SELECT glossary_id, book_id, term, distance
+    FROM (
+        SELECT
+            ge.glossary_id,
+            ge.book_id,
+            ge.term,
+            ge.embedding <=> CAST(:embedding AS {embedding_type}) as distance
+        FROM glossary_embeddings ge
+        WHERE ge.book_id = :book_id
+        OFFSET 0
+    ) book_rows
+    ORDER BY distance
+    LIMIT :limit
+"""
+
+# Similarity = 1 - (distance / 2) where distance is cosine distance. The nearest rows are
+# found first, computing each distance once; the threshold then trims that prefix of the
+# distance order (similarity >= t  <=>  distance <= 2 * (1 - t)) and the joins only touch
+# `limit` rows. Everything is a bound parameter so the statement text (and its plan) is reused.
+SEMANTIC_SEARCH_TEMPLATE = """
+    SELECT
+        nearest.glossary_id,
+        nearest.book_id,
+        nearest.term,
+        g.description,
+        b.original_book_title as book_name,
+        (1 - nearest.distance / 2) as similarity
+    FROM ({nearest}) nearest
+    JOIN glossary g ON nearest.glossary_id = g.glossary_id
+    JOIN book b ON nearest.book_id = b.book_id
+    WHERE nearest.distance <= :max_distance
+    ORDER BY nearest.distance
+"""
+# One statement per embedding column type
+SEMANTIC_SEARCH_SQL = {
+    embedding_type: text(SEMANTIC_SEARCH_TEMPLATE.format(nearest=NEAREST_SQL).format(embedding_type=embedding_type))
+    for embedding_type in EMBEDDING_TYPES
+}
+SEMANTIC_SEARCH_IN_BOOK_SQL = {
+    embedding_type: text(SEMANTIC_SEARCH_TEMPLATE.format(nearest=NEAREST_IN_BOOK_SQL).format(embedding_type=embedding_type))
+    for embedding_type in EMBEDDING_TYPES
+}
 
 
 class GlossaryEmbeddingService:
     @staticmethod
-    def semantic_search(
-        db: Session,
+    async def semantic_search(
+        db: AsyncSession,
         query_embedding: List[float],
         limit: int = 10,
         book_id: Optional[int] = None,
@@ -233,66 +605,106 @@ class GlossaryEmbeddingService:
         Returns:
             List of dictionaries containing glossary terms with similarity scores
         """
-        # Convert Python list to PostgreSQL array format for pgvector
-        embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-
-        # Build the base query with cosine similarity
         # Note: pgvector's <=> operator returns distance (0 = identical, 2 = opposite)
         # We convert to similarity score: similarity = 1 - (distance / 2)
-        query = db.query(
+        # The nearest `limit` rows are found first, computing each distance once; ordering
+        # by the raw distance lets Postgres walk the HNSW index
+        # Bound as a prebuilt literal so pgvector's bind processor doesn't re-stringify the vector
+        embedding = cast(bindparam('embedding', _vector_literal(query_embedding), type_=String), EMBEDDING_TYPES[_embedding_type])
+        distance = GlossaryEmbedding.embedding.cosine_distance(embedding).label('distance')
+        nearest = select(
             GlossaryEmbedding.glossary_id,
             GlossaryEmbedding.book_id,
             GlossaryEmbedding.term,
-            Glossary.description,
-            Book.original_book_title.label('book_name'),
             GlossaryEmbedding.created_at,
             GlossaryEmbedding.updated_at,
-            (1 - (GlossaryEmbedding.embedding.cosine_distance(embedding_str)) / 2).label('similarity')
-        ).join(
-            Glossary, GlossaryEmbedding.glossary_id == Glossary.glossary_id
-        ).join(
-            Book, GlossaryEmbedding.book_id == Book.book_id
+            distance
         )
 
-        # Apply book_id filter if provided
-        if book_id is not None:
-            query = query.filter(GlossaryEmbedding.book_id == book_id)
-
-        # Filter by similarity threshold and order by similarity (descending)
-        query = query.having(
-            text(f"(1 - (embedding <=> '{embedding_str}') / 2) >= {similarity_threshold}")
-        ).order_by(
-            text('similarity DESC')
-        ).limit(limit)
+        if book_id is None:
+            nearest = nearest.order_by(distance).limit(limit).subquery()
+        else:
+            # Exact search within the book, fenced by OFFSET 0 (see NEAREST_IN_BOOK_SQL)
+            book_rows = nearest.where(GlossaryEmbedding.book_id == book_id).offset(0).subquery()
+            nearest = select(book_rows).order_by(book_rows.c.distance).limit(limit).subquery()
+
+        # Rows clearing the threshold are a prefix of the distance order, so filtering
+        # after the limit returns the same results; the joins only touch `limit` rows.
+        # The threshold is compared in distance form: similarity >= t  <=>  distance <= 2 * (1 - t)
+        similarity = 1 - nearest.c.distance / 2
+        query = select(
+            nearest.c.glossary_id,
+            nearest.c.book_id,
+            nearest.c.term,
+            Glossary.description,
+            Book.original_book_title.label('book_name'),
+            nearest.c.created_at,
+            nearest.c.updated_at,
+            similarity.label('similarity')
+        ).join(
+            Glossary, nearest.c.glossary_id == Glossary.glossary_id
+        ).join(
+            Book, nearest.c.book_id == Book.book_id
+        ).where(nearest.c.distance <= 2 * (1 - similarity_threshold)).order_by(nearest.c.distance)
 
-        return query.all()
+        await _set_hnsw_ef_search(db)
+        result = await db.execute(query)
+        return result.all()
 
     @staticmethod
-    def get_embedding_by_glossary_id(db: Session, glossary_id: int) -> Optional[GlossaryEmbedding]:
+    async def get_embedding_by_glossary_id(db: AsyncSession, glossary_id: int) -> Optional[GlossaryEmbedding]:
         """Get glossary embedding by glossary_id"""
-        return db.query(GlossaryEmbedding).filter(
+        return await db.scalar(select(GlossaryEmbedding).where(
             GlossaryEmbedding.glossary_id == glossary_id
-        ).first()
+        ).limit(1))
+
+    @staticmethod
+    async def get_embeddings_by_book(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
+        """Get glossary embedding metadata (without the vectors) for a specific book"""
+        result = await db.execute(select(
+            *(getattr(GlossaryEmbedding, field) for field in EMBEDDING_SUMMARY_FIELDS)
+        ).where(
+            GlossaryEmbedding.book_id == book_id
+        ).order_by(GlossaryEmbedding.term).offset(skip).limit(limit))
+        return result.mappings().all()
 
     @staticmethod
-    def get_embeddings_by_book(db: Session, book_id: int, skip: int = 0, limit: int = 100) -> List[GlossaryEmbedding]:
-        """Get all glossary embeddings for a specific book"""
-        return db.query(GlossaryEmbedding).filter(
+    async def get_embeddings_by_book_page(db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100) -> Tuple[List[dict], int]:
+        """Get a page of glossary embedding metadata for a book together with the book's embedding count"""
+        rows, total = await _fetch_page(db, select(
+            *(getattr(GlossaryEmbedding, field) for field in EMBEDDING_SUMMARY_FIELDS)
+        ).where(
             GlossaryEmbedding.book_id == book_id
-        ).order_by(GlossaryEmbedding.term).offset(skip).limit(limit).all()
+        ).order_by(GlossaryEmbedding.term).offset(skip).limit(limit), skip)
+        # zip() stops before the trailing windowed total column
+        return [dict(zip(EMBEDDING_SUMMARY_FIELDS, row)) for row in rows], total
 
     @staticmethod
-    def get_embeddings_count(db: Session, book_id: Optional[int] = None) -> int:
+    @cached()
+    async def get_embeddings_count(db: AsyncSession, book_id: Optional[int] = None) -> int:
         """Get total count of glossary embeddings, optionally filtered by book_id"""
-        query = db.query(func.count(GlossaryEmbedding.glossary_id))
+        query = select(func.count(GlossaryEmbedding.glossary_id))
         if book_id is not None:
-            query = query.filter(GlossaryEmbedding.book_id == book_id)
-        return query.scalar()
+            query = query.where(GlossaryEmbedding.book_id == book_id)
+        return await db.scalar(query)
 
     @staticmethod
-    def semantic_search_all_books(
-        db: Session,
-        query_embedding: List[float],
+    @cached()
+    async def get_counts_by_book(db: AsyncSession) -> List[dict]:
+        """Get embedding counts per book (books without embeddings are omitted)"""
+        result = await db.execute(select(
+            Book.book_id,
+            Book.original_book_title.label('book_name'),
+            func.count(GlossaryEmbedding.glossary_id).label('embedding_count')
+        ).join(
+            GlossaryEmbedding, GlossaryEmbedding.book_id == Book.book_id
+        ).group_by(Book.book_id, Book.original_book_title).order_by(Book.book_id))
+        return result.all()
+
+    @staticmethod
+    async def semantic_search_all_books(
+        db: AsyncSession,
+        query_embedding: np.ndarray,
         limit: int = 5,
         book_id: Optional[int] = None,
         similarity_threshold: float = 0.5
@@ -310,28 +722,22 @@ class GlossaryEmbeddingService:
         Returns:
             List of dictionaries with term, description, book_name, book_id
         """
-        # Convert Python list to PostgreSQL array format
-        embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-
-        # Build query with cosine similarity
-        # We use raw SQL to properly handle pgvector operations
-        # Similarity = 1 - (distance / 2) where distance is cosine distance
-        sql = text(f"""
-            SELECT
-                ge.glossary_id,
-                ge.book_id,
-                ge.term,
-                g.description,
-                b.original_book_title as book_name,
-                (1 - (ge.embedding <=> '{embedding_str}'::vector) / 2) as similarity
-            FROM glossary_embeddings ge
-            JOIN glossary g ON ge.glossary_id = g.glossary_id
-            JOIN book b ON ge.book_id = b.book_id
-            WHERE (1 - (ge.embedding <=> '{embedding_str}'::vector) / 2) >= {similarity_threshold}
-                {f"AND ge.book_id = {book_id}" if book_id is not None else ""}
-            ORDER BY similarity DESC
-            LIMIT {limit}
-        """)
-
-        result = db.execute(sql)
-        return result.fetchall()
\ No newline at end of file
+        # Repeated queries (e.g. a cached embedding) reuse the encoded literal
+        embedding_str = _vector_literal(query_embedding)
+
+        # Raw SQL (see SEMANTIC_SEARCH_TEMPLATE); a book-scoped search is its own statement,
+        # an exact search within the book, so each shape keeps its own plan
+        params = {
+            "embedding": embedding_str,
+            "max_distance": 2 * (1 - similarity_threshold),
+            "limit": limit
+        }
+        if book_id is None:
+            await _set_hnsw_ef_search(db)
+            sql = SEMANTIC_SEARCH_SQL[_embedding_type]
+        else:
+            sql = SEMANTIC_SEARCH_IN_BOOK_SQL[_embedding_type]
+            params["book_id"] = book_id
+
+        result = await db.execute(sql, params)
+        return result.fetchall()
@@ -0,0 +1,80 @@
+"""
+In-memory index of glossary terms for exact and prefix lookups
+"""
+from typing import List, Optional, Set
+import logging
+
+import marisa_trie
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Glossary
+
+logger = logging.getLogger(__name__)
+
+
+class GlossaryTermIndex:
+    """
+    Trie of lowercased glossary terms mapping to (book_id, glossary_id).
+
+    Lets the text search fallback resolve exact and prefix term matches without an
+    ILIKE scan; anything the trie cannot answer still goes to Postgres. A set of every
+    trigram in the terms and descriptions rules out substring searches that cannot match.
+    """
+
+    def __init__(self):
+        self._trie: Optional[marisa_trie.RecordTrie] = None
+        self._trigrams: Optional[Set[str]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._trie is not None
+
+    async def load(self, db: AsyncSession):
+        """(Re)build the trie from the glossary table; call again after glossary changes"""
+        result = await db.execute(
+            select(Glossary.term, Glossary.description, Glossary.book_id, Glossary.glossary_id)
+        )
+        records = []
+        trigrams = set()
+        for term, description, book_id, glossary_id in result:
+            records.append((term.lower(), (book_id, glossary_id)))
+            trigrams.update(_trigrams(term.lower()))
+            trigrams.update(_trigrams((description or "").lower()))
+        self._trie = marisa_trie.RecordTrie("<II", records)
+        self._trigrams = trigrams
+        logger.info(f"Loaded {len(self._trie)} glossary terms and {len(trigrams)} trigrams into the term index")
+
+    def lookup(self, query: str, book_id: Optional[int] = None) -> List[int]:
+        """
+        Return glossary ids whose term equals or starts with the query (case-insensitive),
+        exact matches first and then by term.
+        """
+        if self._trie is None:
+            return []
+        key = query.strip().lower()
+        if not key:
+            return []
+        matches = sorted(
+            (term != key, term, glossary_id)
+            for term, (term_book_id, glossary_id) in self._trie.items(key)
+            if book_id is None or term_book_id == book_id
+        )
+        return [glossary_id for _, _, glossary_id in matches]
+
+    def may_contain(self, query: str) -> bool:
+        """
+        False only when no term or description can contain the query (case-insensitive),
+        i.e. an ILIKE '%query%' search is guaranteed to come back empty.
+        """
+        if self._trigrams is None or any(c in query for c in "%_\\"):
+            return True
+        return all(trigram in self._trigrams for trigram in _trigrams(query.lower()))
+
+
+def _trigrams(text: str):
+    return (text[i:i + 3] for i in range(len(text) - 2))
+
+
+# Global instance
+glossary_term_index = GlossaryTermIndex()
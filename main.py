@@ -6,5 +6,5 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        reload=True  # Development only; incompatible with multiple workers
     )
\ No newline at end of file
@@ -1,14 +1,18 @@
+import os
 import uvicorn
 from app.main import app
 
 if __name__ == "__main__":
     # SSL-enabled FastAPI server for direct HTTPS access
-    # This bypasses nginx and serves HTTPS directly from FastAPI
+    # This bypasses nginx and serves HTTPS directly from FastAPI. No reload here: it is
+    # development only and pins the server to one process; use main.py while developing.
+    # For HTTP/2 and OCSP stapling, terminate TLS at nginx instead (see nginx/).
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8443,
         ssl_keyfile="ssl/purebhaktibase.com.key",
         ssl_certfile="ssl/purebhaktibase.com.crt",
-        reload=True
-    )
\ No newline at end of file
+        # Same knob as the Docker image; see DOCKER_README for sizing against the DB pool
+        workers=int(os.getenv("UVICORN_WORKERS", "4"))
+    )
@@ -0,0 +1,13 @@
+-- Indexes for glossary term lookups.
+-- Apply with: psql "$DATABASE_URL" -f migrations/001_glossary_term_indexes.sql
+-- CONCURRENTLY avoids locking the table, so run outside an explicit transaction.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- GET /books/{book_id}/glossary/{term}
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_glossary_book_term
+    ON glossary (book_id, term);
+
+-- ILIKE '%term%' searches across books (/glossary/search-legacy, text search fallback)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_glossary_term_trgm
+    ON glossary USING gin (term gin_trgm_ops);
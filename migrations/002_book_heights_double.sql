@@ -0,0 +1,8 @@
+-- Store page header/footer heights as double precision instead of NUMERIC(5,2).
+-- Apply with: psql "$DATABASE_URL" -f migrations/002_book_heights_double.sql
+-- Converting straight from NUMERIC keeps the stored values exact (12.35 stays 12.35);
+-- REAL would come back from asyncpg widened (12.350000381469727).
+
+ALTER TABLE book
+    ALTER COLUMN header_height TYPE double precision USING header_height::double precision,
+    ALTER COLUMN footer_height TYPE double precision USING footer_height::double precision;
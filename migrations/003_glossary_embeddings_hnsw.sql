@@ -0,0 +1,8 @@
+-- HNSW index so cosine-distance searches on glossary embeddings avoid a full scan.
+-- Requires pgvector >= 0.5.
+-- Apply with: psql "$DATABASE_URL" -f migrations/003_glossary_embeddings_hnsw.sql
+-- CONCURRENTLY avoids locking the table, so run outside an explicit transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_glossary_embeddings_embedding_hnsw
+    ON glossary_embeddings USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
@@ -0,0 +1,6 @@
+-- Composite index for listing a book's table of contents in order.
+-- Apply with: psql "$DATABASE_URL" -f migrations/004_toc_book_order_index.sql
+-- CONCURRENTLY avoids locking the table, so run outside an explicit transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_toc_book_order
+    ON table_of_contents (book_id, toc_id);
@@ -0,0 +1,10 @@
+-- Trigram index for substring searches on glossary descriptions.
+-- Apply with: psql "$DATABASE_URL" -f migrations/005_glossary_description_trgm.sql
+-- CONCURRENTLY avoids locking the table, so run outside an explicit transaction.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Text search fallback matches term OR description with ILIKE '%query%';
+-- with ix_glossary_term_trgm both sides can be answered by a BitmapOr
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_glossary_description_trgm
+    ON glossary USING gin (description gin_trgm_ops);
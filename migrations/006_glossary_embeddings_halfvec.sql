@@ -0,0 +1,36 @@
+-- Store glossary embeddings as half-precision vectors (2 bytes per dimension instead of 4),
+-- halving the bytes read per distance computation and the size of the HNSW index.
+-- Hard requirement: pgvector >= 0.7 (halfvec does not exist in 0.6.x; check with
+-- SELECT extversion FROM pg_extension WHERE extname = 'vector').
+-- Apply with: psql "$DATABASE_URL" -f migrations/006_glossary_embeddings_halfvec.sql
+-- The application reads the column type at startup and casts query vectors to match, so it
+-- runs before and after this migration; restart it after applying so it picks up halfvec.
+-- Rewrites the table and rebuilds the index under an exclusive lock, so run in a quiet window.
+
+BEGIN;
+
+-- Every index built with a vector opclass has to go before the type change, or the ALTER
+-- fails trying to rebuild it: the HNSW index from 003 and the original IVFFlat index
+-- (created outside these migrations, so its name is not known here)
+DO $$
+DECLARE
+    idx record;
+BEGIN
+    FOR idx IN
+        SELECT schemaname, indexname
+        FROM pg_indexes
+        WHERE tablename = 'glossary_embeddings'
+          AND indexdef ~ '\mvector_\w+_ops\M'
+    LOOP
+        EXECUTE format('DROP INDEX %I.%I', idx.schemaname, idx.indexname);
+    END LOOP;
+END $$;
+
+ALTER TABLE glossary_embeddings
+    ALTER COLUMN embedding TYPE halfvec(1024) USING embedding::halfvec(1024);
+
+CREATE INDEX ix_glossary_embeddings_embedding_hnsw
+    ON glossary_embeddings USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- Composite, covering and partial indexes for per-book page lookups.
+-- Apply with: psql "$DATABASE_URL" -f migrations/007_page_covering_indexes.sql
+-- CONCURRENTLY avoids locking the tables, so run outside an explicit transaction.
+
+-- Page fetches (book_id = ? AND page_number = ?) and per-book listings ordered by
+-- page_number; rows carry the page text, so there is nothing small worth INCLUDE-ing
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_content_book_page
+    ON content (book_id, page_number);
+
+-- Page map listings in page order; page_type and page_label ride along so the
+-- Primary-page fallback for core pages is an index-only scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_page_map_book_page
+    ON page_map (book_id, page_number) INCLUDE (page_type, page_label);
+
+-- Core pages only: answers both the core page listing and the "has core pages" check
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_page_map_core
+    ON page_map (book_id, page_number) INCLUDE (page_label)
+    WHERE page_type = 'Core';
+
+-- Index-only scans rely on the visibility map
+VACUUM (ANALYZE) content, page_map;
@@ -0,0 +1,76 @@
+"""
+Shared fixtures.
+
+The tests run the app against the database configured through the usual settings
+(DATABASE_URL or DB_*), which needs at least one book with content, glossary terms and
+a table of contents. They are skipped when that database is unreachable or has no books.
+"""
+import asyncio
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.cache import book_cache, book_exists_cache, books_version_cache, query_cache
+from app.database import engine
+from app.main import app
+
+
+def database_skip_reason() -> Optional[str]:
+    """Why the configured database can't back the tests, or None when it can"""
+    async def probe() -> Optional[str]:
+        try:
+            async with engine.connect() as conn:
+                has_books = await conn.scalar(text("SELECT EXISTS (SELECT 1 FROM book)"))
+        except Exception as e:
+            return f"database unavailable: {e}"
+        finally:
+            # The probe runs on its own event loop; don't hand its connections to the app's
+            await engine.dispose()
+        return None if has_books else "database has no books"
+
+    return asyncio.run(probe())
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    reason = database_skip_reason()
+    if reason:
+        pytest.skip(reason)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def cold_caches():
+    """Empty the in-process lookup caches so a request pays for every query it can issue"""
+    for cache in (book_cache, book_exists_cache, books_version_cache, query_cache):
+        cache.clear()
+
+
+@pytest.fixture
+def count_queries(cold_caches):
+    """
+    Collect the SQL of every statement the engine executes inside the block, for
+    asserting per-request query budgets:
+
+        with count_queries() as queries:
+            client.get("/api/v1/books")
+        assert len(queries) <= 2
+    """
+    @contextmanager
+    def counting() -> Iterator[List[str]]:
+        queries: List[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield queries
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    return counting
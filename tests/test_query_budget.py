@@ -0,0 +1,96 @@
+"""
+Per-request query budgets for the list, page and search endpoints.
+
+Budgets are measured with the response cache bypassed and the in-process caches cold,
+so they are the most statements a request can issue. A failure means a change added a
+round-trip (e.g. an N+1 or a separate count query); raise a budget only deliberately.
+"""
+import pytest
+
+from app.services.ollama_service import ollama_service
+
+# Skip the response cache so every request runs its queries
+NO_CACHE = {"Cache-Control": "no-cache"}
+
+
+@pytest.fixture(scope="module")
+def book_id(client) -> int:
+    books = client.get("/api/v1/books", params={"size": 1}, headers=NO_CACHE).json()["books"]
+    if not books:
+        pytest.skip("database has no books")
+    return books[0]["book_id"]
+
+
+@pytest.fixture
+def text_search_only(monkeypatch):
+    """Make embedding generation fail so glossary search takes the text fallback"""
+    async def no_embedding(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(ollama_service, "generate_embedding", no_embedding)
+
+
+@pytest.mark.parametrize("path, params, budget", [
+    # Book list: version ETag, then the page with its windowed total
+    ("/api/v1/books", {}, 2),
+    # Keyset page: ETag, page, cached total
+    ("/api/v1/books", {"after": 0}, 3),
+    # Past the end: ETag, empty page, separate count
+    ("/api/v1/books", {"page": 1000}, 3),
+    ("/api/v1/books/{book_id}", {}, 1),
+])
+def test_book_list_budget(client, count_queries, book_id, path, params, budget):
+    with count_queries() as queries:
+        response = client.get(path.format(book_id=book_id), params=params, headers=NO_CACHE)
+    assert response.status_code == 200
+    assert len(queries) <= budget, queries
+
+
+@pytest.mark.parametrize("path, params, budget", [
+    # Rows and windowed total in one statement
+    ("/api/v1/books/{book_id}/content", {}, 1),
+    # Keyset page, then the cached total
+    ("/api/v1/books/{book_id}/content", {"after": 0}, 2),
+    # Past the end: empty page, book existence check, separate count
+    ("/api/v1/books/{book_id}/content", {"page": 100000}, 3),
+    # Glossary page, then one lookup for every book name on it
+    ("/api/v1/books/{book_id}/glossary", {}, 2),
+    ("/api/v1/books/{book_id}/toc/paginated", {}, 1),
+    ("/api/v1/books/{book_id}/toc/paginated", {"after": 0}, 2),
+    # Book ETag, then the TOC streamed in batches (one batch for a small book)
+    ("/api/v1/books/{book_id}/toc", {}, 2),
+    ("/api/v1/books/{book_id}/pages", {}, 2),
+    # Book ETag, then Core pages (or Primary pages) in one statement
+    ("/api/v1/books/{book_id}/pages/core", {}, 2),
+])
+def test_book_page_budget(client, count_queries, book_id, path, params, budget):
+    with count_queries() as queries:
+        response = client.get(path.format(book_id=book_id), params=params, headers=NO_CACHE)
+    assert response.status_code == 200
+    assert len(queries) <= budget, queries
+
+
+@pytest.mark.parametrize("params, budget", [
+    # Matches with their windowed total, then one lookup for the book names
+    ({"term": "a"}, 2),
+    ({"term": "a", "compact": "true"}, 2),
+])
+def test_legacy_search_budget(client, count_queries, params, budget):
+    with count_queries() as queries:
+        response = client.get("/api/v1/glossary/search-legacy", params=params)
+    assert response.status_code == 200
+    assert len(queries) <= budget, queries
+
+
+@pytest.mark.parametrize("scoped, budget", [
+    # Ranked term/description matches, then the book names
+    (False, 2),
+    # Book-scoped: the existence check comes first
+    (True, 3),
+])
+def test_text_search_budget(client, count_queries, text_search_only, book_id, scoped, budget):
+    payload = {"query": "devotional", "book_id": book_id if scoped else None}
+    with count_queries() as queries:
+        response = client.post("/api/v1/glossary/search", json=payload)
+    assert response.status_code == 200
+    assert len(queries) <= budget, queries